@@ -5,22 +5,30 @@ import pandas as pd
 import matplotlib.pyplot as plt
 import seaborn as sns
 from wordcloud import WordCloud
+from data_analysis import count_tokens, count_whitespace_tokens, parse_publish_time, read_metadata_csv
 
 # ===============================
 # 1. DATA LOADING
 # ===============================
 @st.cache_data
-def load_data():
-    df = pd.read_csv("metadata.csv", low_memory=False)
+def load_data(engine="pyarrow", block_size=None, threads=None):
+    # Multi-threaded pyarrow parser by default; falls back to the C parser
+    df = read_metadata_csv(
+        "metadata.csv", engine=engine, block_size=block_size, threads=threads, schema=None
+    )
+
+    # Keep the text columns in Arrow buffers so string operations run as Arrow kernels
+    for column in ("title", "abstract"):
+        df[column] = df[column].astype("string[pyarrow]")
 
     # Convert publish_time to datetime safely
-    df["publish_time"] = pd.to_datetime(df["publish_time"], errors="coerce")
+    df["publish_time"] = parse_publish_time(df["publish_time"])
 
     # Ensure publish_time is stored as string for Arrow compatibility
     df["publish_time_str"] = df["publish_time"].dt.strftime("%Y-%m-%d")
 
     # Add abstract word count
-    df["abstract_word_count"] = df["abstract"].fillna("").apply(lambda x: len(str(x).split()))
+    df["abstract_word_count"] = count_tokens(df["abstract"])
 
     return df
 
@@ -88,8 +96,7 @@ with tab3:
     st.write(df["journal"].value_counts().head(10))
 
     st.write("**Most Frequent Words in Titles**")
-    titles = " ".join(df["title"].dropna().astype(str).tolist()).lower().split()
-    word_freq = pd.Series(titles).value_counts().head(10)
+    word_freq = pd.Series(count_whitespace_tokens(df["title"])).sort_values(ascending=False).head(10)
     st.write(word_freq)
 
 
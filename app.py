@@ -6,12 +6,15 @@ A simple web app for exploring COVID-19 research papers
 import streamlit as st
 import pandas as pd
 import matplotlib.pyplot as plt
-from data_analysis import CORD19Analyzer
+from data_analysis import CORD19Analyzer, LoadCancelled, contains_text, count_words, top_counts
 import plotly.express as px
 import plotly.graph_objects as go
 from wordcloud import WordCloud
 import re
-from collections import Counter
+import os
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
 
 # Page configuration
 st.set_page_config(
@@ -45,6 +48,188 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
+DATA_PATH = 'metadata.csv'
+
+# Optional Arrow IPC file shared through the page cache by every Streamlit
+# process on the host; set CORD19_ARROW_PATH to enable it
+ARROW_PATH = os.environ.get('CORD19_ARROW_PATH')
+
+# Rows in the preview sample, and how long to wait for the full load before showing it
+PREVIEW_ROWS = 5000
+PREVIEW_WAIT_SECONDS = 1.0
+
+# How often the page reruns to refresh the load status while the full load runs
+POLL_SECONDS = 1.0
+
+# st.rerun replaced st.experimental_rerun after the pinned streamlit release
+rerun = getattr(st, 'rerun', None) or st.experimental_rerun
+
+
+def dataset_version(path):
+    """
+    Return a cheap identifier of the dataset file on disk (size and mtime)
+    """
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return (stat.st_size, stat.st_mtime_ns)
+
+
+def load_shared_analyzer(path, status):
+    """
+    Load and clean the full dataset into a frozen analyzer
+    
+    The returned analyzer is shared read-only by every session. With
+    ARROW_PATH set, the cleaned data is memory-mapped from a file that the
+    first process to start writes for the others. Abstracts are only read
+    from the cache once a section needs them. status['phase'] names the
+    step in progress and status['progress'] holds the latest parse progress,
+    for display in the sidebar; setting status['cancel'] abandons the load.
+    """
+    analyzer = CORD19Analyzer(path, lazy_columns=['abstract'])
+    if ARROW_PATH:
+        status['phase'] = "Opening shared Arrow file"
+        if analyzer.open_arrow(ARROW_PATH):
+            return analyzer.freeze()
+    
+    # Cached cleaned columns skip both CSV parsing and cleaning
+    status['phase'] = "Reading cache"
+    if not analyzer.load_cleaned():
+        status['phase'] = "Parsing CSV"
+        loaded = analyzer.load_data(
+            progress=lambda progress: status.update(progress=progress),
+            cancel=status['cancel'],
+        )
+        if status['cancel'].is_set():
+            raise LoadCancelled(path)
+        if not loaded:
+            raise FileNotFoundError(path)
+        status['phase'] = "Cleaning data"
+        analyzer.clean_data()
+    
+    if ARROW_PATH:
+        status['phase'] = "Writing shared Arrow file"
+        if analyzer.export_arrow(ARROW_PATH):
+            # Serve from the mapping as well, dropping this process's private copy
+            mapped = CORD19Analyzer(path)
+            if mapped.open_arrow(ARROW_PATH):
+                analyzer = mapped
+    return analyzer.freeze()
+
+
+@st.cache_resource
+def active_load():
+    """
+    Return the process-wide record of the most recently started load
+    """
+    return {}
+
+
+@st.cache_resource(max_entries=1)
+def start_full_load(path, version):
+    """
+    Start loading the full dataset in a background thread, once per process and dataset version
+    
+    Returns (future of the shared analyzer, status dict). max_entries=1
+    drops the previous version when the file changes, and a load still
+    parsing the previous version is cancelled instead of running to the end.
+    """
+    status = {'phase': "Starting", 'started': time.time(), 'progress': None, 'cancel': threading.Event()}
+    current = active_load()
+    if 'status' in current:
+        current['status']['cancel'].set()
+    current['status'] = status
+    executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='cord19-load')
+    future = executor.submit(load_shared_analyzer, path, status)
+    executor.shutdown(wait=False)
+    return future, status
+
+
+@st.cache_resource(show_spinner="Sampling data...", max_entries=1)
+def get_preview_analyzer(path, version, _cancel):
+    """
+    Load a uniform row sample of the dataset to show while the full load runs
+    
+    The sample is drawn in a worker thread while this one shows its progress
+    in the sidebar. Setting _cancel (not part of the cache key) abandons it;
+    the script run being interrupted sets it too. A cancelled sample raises
+    LoadCancelled.
+    """
+    analyzer = CORD19Analyzer(path)
+    status = {'progress': None}
+    bar = st.sidebar.progress(0.0, text="Sampling data...")
+    with ThreadPoolExecutor(max_workers=1, thread_name_prefix='cord19-sample') as executor:
+        sampling = executor.submit(
+            analyzer.load_sample, PREVIEW_ROWS,
+            progress=lambda progress: status.update(progress=progress), cancel=_cancel,
+        )
+        try:
+            while not wait([sampling], timeout=0.1).done:
+                progress = status['progress']
+                if progress is not None:
+                    bar.progress(
+                        min(progress['fraction'], 1.0),
+                        text=f"Sampling {progress['bytes'] / 1e6:,.0f} of "
+                             f"{progress['total_bytes'] / 1e6:,.0f} MB",
+                    )
+        finally:
+            if not sampling.done():
+                _cancel.set()
+    bar.empty()
+    if not sampling.result():
+        # Raise instead of returning so a failed load is not cached
+        if _cancel.is_set():
+            raise LoadCancelled(path)
+        raise FileNotFoundError(path)
+    return analyzer.freeze()
+
+
+def preview_cancel_event(future):
+    """
+    Return this session's cancel event for the preview sample
+    
+    The event is set once the full load finishes, so a session still drawing
+    the sample stops and shows the full dataset instead.
+    """
+    cancel = st.session_state.get('preview_cancel')
+    if cancel is None or cancel[0] is not future or cancel[1].is_set():
+        event = threading.Event()
+        future.add_done_callback(lambda _: event.set())
+        cancel = st.session_state.preview_cancel = (future, event)
+    return cancel[1]
+
+
+def show_load_status(future, status):
+    """
+    Report the progress of the background load in the sidebar
+    """
+    if future.done():
+        return
+    elapsed = time.time() - status['started']
+    st.sidebar.info(f"Preparing data in the background: {status['phase']} ({elapsed:.0f}s)")
+    progress = status['progress']
+    if progress is not None and status['phase'] == "Parsing CSV":
+        eta = f", about {progress['eta']:.0f}s left" if progress['eta'] is not None else ""
+        st.sidebar.progress(
+            min(progress['fraction'], 1.0),
+            text=f"{progress['bytes'] / 1e6:,.0f} of {progress['total_bytes'] / 1e6:,.0f} MB, "
+                 f"~{progress['rows']:,} rows{eta}",
+        )
+
+
+def poll_load(future):
+    """
+    Rerun the page after a short pause while the background load is pending
+    
+    Called once the page has been drawn, so the load status stays live and
+    the full dataset replaces the preview as soon as it is ready.
+    """
+    if not future.done():
+        time.sleep(POLL_SECONDS)
+        rerun()
+
+
 def main():
     # Header
     st.markdown('<h1 class="main-header">CORD-19 Research Data Explorer</h1>', 
@@ -56,10 +241,6 @@ def main():
     journal distributions, and research topics through interactive visualizations.
     """)
     
-    # Initialize analyzer
-    if 'analyzer' not in st.session_state:
-        st.session_state.analyzer = CORD19Analyzer('metadata.csv')
-    
     # Sidebar
     st.sidebar.title("Navigation")
     app_mode = st.sidebar.selectbox(
@@ -68,23 +249,50 @@ def main():
          "Content Analysis", "Source Analysis", "Interactive Explorer"]
     )
     
-    # Load data
-    if st.sidebar.button("Load Data") or 'data_loaded' in st.session_state:
-        with st.spinner("Loading data..."):
-            if st.session_state.analyzer.load_data():
-                st.session_state.analyzer.clean_data()
-                st.session_state.data_loaded = True
-                st.sidebar.success("Data loaded successfully!")
-            else:
-                st.sidebar.error("Error loading data. Please check if metadata.csv exists.")
+    # The first script run in this process starts loading in the background,
+    # before anyone asks for data, so visitors find it warm
+    version = dataset_version(DATA_PATH)
+    future, status = start_full_load(DATA_PATH, version)
+    
+    # Sessions only remember that they asked for data; the analyzer itself is a
+    # process-wide snapshot rebuilt once per dataset version, not per rerun or user
+    if st.sidebar.button("Load Data"):
+        st.session_state.data_requested = True
     
-    if 'data_loaded' not in st.session_state:
+    if not st.session_state.get('data_requested'):
+        show_load_status(future, status)
         st.info("Please click 'Load Data' in the sidebar to begin analysis")
+        poll_load(future)
         return
     
-    # Get cleaned data
-    df_cleaned = st.session_state.analyzer.df_cleaned
-    analyzer = st.session_state.analyzer
+    # Fast loads (e.g. from the cache) skip the preview altogether
+    wait([future], timeout=PREVIEW_WAIT_SECONDS)
+    if future.done() and future.exception() is not None:
+        # Forget the failed load so the next run retries it
+        start_full_load.clear()
+    try:
+        if future.done():
+            analyzer = future.result()
+        else:
+            analyzer = get_preview_analyzer(DATA_PATH, version, preview_cancel_event(future))
+    except LoadCancelled:
+        # The full load finished while the sample was drawn
+        rerun()
+    except FileNotFoundError:
+        st.sidebar.error("Error loading data. Please check if metadata.csv exists.")
+        return
+    
+    if analyzer.is_sample:
+        show_load_status(future, status)
+        st.warning(
+            f"Showing approximate results from a uniform sample of {len(analyzer.df_cleaned):,} "
+            f"of {analyzer.population_size:,} papers until the full dataset has loaded."
+        )
+    else:
+        st.sidebar.success("Data loaded successfully!")
+    
+    # Shared read-only frame: filter into new frames, never modify in place
+    df_cleaned = analyzer.df_cleaned
     
     # Data Overview Section
     if app_mode == "Data Overview":
@@ -111,7 +319,7 @@ def main():
         
         # Missing values analysis
         st.subheader("Missing Values Analysis")
-        missing_data = df_cleaned.isnull().sum()
+        missing_data = analyzer.missing_values()
         missing_data = missing_data[missing_data > 0]
         
         if len(missing_data) > 0:
@@ -124,6 +332,10 @@ def main():
             st.plotly_chart(fig_missing, use_container_width=True)
         else:
             st.success("No missing values in the cleaned dataset!")
+        
+        # Memory footprint, computed on request since deep sizes scan every string
+        if st.checkbox("Show memory usage by column"):
+            st.dataframe(analyzer.memory_report(), use_container_width=True)
     
     # Publication Trends Section
     elif app_mode == "Publication Trends":
@@ -197,7 +409,7 @@ def main():
         
         with col2:
             # Get journal counts
-            journal_counts = df_cleaned['journal_clean'].value_counts()
+            journal_counts = top_counts(df_cleaned['journal_clean'])
             journal_counts = journal_counts[journal_counts >= min_papers].head(top_n)
             
             fig = px.bar(
@@ -258,37 +470,41 @@ def main():
             with col2:
                 # Prepare text
                 if analysis_type == "Titles":
-                    text = ' '.join(df_cleaned['title'].dropna().astype(str))
+                    texts = df_cleaned['title']
                 else:
-                    text = ' '.join(df_cleaned['abstract'].dropna().astype(str))
+                    with_abstracts = analyzer.ensure_columns('abstract')
+                    texts = with_abstracts['abstract'] if with_abstracts is not None else None
                 
-                # Clean and count words
-                words = re.findall(r'\b[a-zA-Z]{3,}\b', text.lower())
+                if texts is None:
+                    st.error("Error loading abstracts. Please reload the data.")
+                else:
+                    # Count words with Arrow's string kernels
+                    word_freq = count_words(texts)
                 
-                # Standard stop words
-                standard_stop_words = {'the', 'and', 'of', 'in', 'to', 'a', 'for', 'with', 'on', 'by', 
-                                     'as', 'an', 'from', 'that', 'this', 'is', 'are', 'was', 'were', 
-                                     'be', 'been', 'have', 'has', 'had', 'but', 'not', 'at', 'which'}
+                    # Standard stop words
+                    standard_stop_words = {'the', 'and', 'of', 'in', 'to', 'a', 'for', 'with', 'on', 'by', 
+                                         'as', 'an', 'from', 'that', 'this', 'is', 'are', 'was', 'were', 
+                                         'be', 'been', 'have', 'has', 'had', 'but', 'not', 'at', 'which'}
                 
-                # Additional stop words from user
-                additional_stop_words = set([word.strip().lower() for word in stop_words.split(',')])
-                all_stop_words = standard_stop_words.union(additional_stop_words)
+                    # Additional stop words from user
+                    additional_stop_words = set([word.strip().lower() for word in stop_words.split(',')])
+                    all_stop_words = standard_stop_words.union(additional_stop_words)
                 
-                filtered_words = [word for word in words if word not in all_stop_words]
-                word_freq = Counter(filtered_words)
-                top_words_list = word_freq.most_common(top_words)
+                    for word in all_stop_words:
+                        word_freq.pop(word, None)
+                    top_words_list = word_freq.most_common(top_words)
                 
-                # Create visualization
-                words, counts = zip(*top_words_list)
+                    # Create visualization
+                    words, counts = zip(*top_words_list)
                 
-                fig = px.bar(
-                    x=counts,
-                    y=words,
-                    orientation='h',
-                    title=f"Top {top_words} Words in {analysis_type}",
-                    labels={'x': 'Frequency', 'y': 'Word'}
-                )
-                st.plotly_chart(fig, use_container_width=True)
+                    fig = px.bar(
+                        x=counts,
+                        y=words,
+                        orientation='h',
+                        title=f"Top {top_words} Words in {analysis_type}",
+                        labels={'x': 'Frequency', 'y': 'Word'}
+                    )
+                    st.plotly_chart(fig, use_container_width=True)
         
         with tab3:
             st.subheader("Abstract Length Analysis")
@@ -320,7 +536,7 @@ def main():
                     unsafe_allow_html=True)
         
         if 'source_x' in df_cleaned.columns:
-            source_counts = df_cleaned['source_x'].value_counts().head(10)
+            source_counts = top_counts(df_cleaned['source_x'], 10)
             
             col1, col2 = st.columns(2)
             
@@ -365,7 +581,7 @@ def main():
         
         with col2:
             # Journal filter (top journals only for performance)
-            top_journals = df_cleaned['journal_clean'].value_counts().head(20).index.tolist()
+            top_journals = top_counts(df_cleaned['journal_clean'], 20).index.tolist()
             journal_filter = st.multiselect(
                 "Filter by Journal",
                 options=top_journals,
@@ -375,8 +591,11 @@ def main():
         with col3:
             keyword_filter = st.text_input("Search in Titles/Abstracts")
         
-        # Apply filters
-        filtered_df = df_cleaned.copy()
+        # Apply filters; the keyword search is the only filter that reads abstracts
+        filtered_df = analyzer.ensure_columns('abstract') if keyword_filter else df_cleaned
+        if filtered_df is None:
+            st.error("Error loading abstracts. Please reload the data.")
+            return
         
         if year_filter:
             filtered_df = filtered_df[filtered_df['publication_year'].isin(year_filter)]
@@ -386,8 +605,8 @@ def main():
         
         if keyword_filter:
             mask = (
-                filtered_df['title'].str.contains(keyword_filter, case=False, na=False) |
-                filtered_df['abstract'].str.contains(keyword_filter, case=False, na=False)
+                contains_text(filtered_df['title'], keyword_filter) |
+                contains_text(filtered_df['abstract'], keyword_filter)
             )
             filtered_df = filtered_df[mask]
         
@@ -412,6 +631,9 @@ def main():
             )
         else:
             st.info("No papers match your current filters. Try adjusting your criteria.")
+    
+    if analyzer.is_sample:
+        poll_load(future)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -10,33 +10,2074 @@ import seaborn as sns
 from wordcloud import WordCloud
 from datetime import datetime
 import re
-from collections import Counter
+import os
+import json
+import glob
+import hashlib
+import time
+import threading
+from collections import Counter, namedtuple
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from itertools import repeat
+from bisect import bisect_left
+import csv
+import io
+import gzip
+import bz2
+import lzma
+import unicodedata
+from functools import lru_cache
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pacsv
+import pyarrow.parquet as pq
+from pandas._libs.parsers import STR_NA_VALUES
 import plotly.express as px
 import plotly.graph_objects as go
 
+# Bump when the on-disk snapshot layout changes so old caches are ignored
+CACHE_FORMAT_VERSION = 3
+
+# Columns of metadata.csv used by the analyzer and the app, with explicit dtypes.
+# Columns not listed here (sha, pdf_json_files, pmc_json_files, s2_id, mag_id,
+# arxiv_id, who_covidence_id, ...) are skipped by the parser entirely.
+# publish_time mixes several date formats, so it is read as text and parsed in clean_data.
+METADATA_SCHEMA = {
+    'cord_uid': 'string',
+    'source_x': 'category',
+    'title': 'string[pyarrow]',
+    'doi': 'string',
+    'pubmed_id': 'Int32',
+    'license': 'category',
+    'abstract': 'string[pyarrow]',
+    'publish_time': 'string',
+    'authors': 'string[pyarrow]',
+    'journal': 'category',
+    'url': 'string',
+    'has_full_text': 'boolean',
+}
+
+
+# Arrow types used to read METADATA_SCHEMA columns with the pyarrow engine
+ARROW_SCHEMA_TYPES = {
+    'string': pa.string(),
+    'string[pyarrow]': pa.string(),
+    'category': pa.dictionary(pa.int32(), pa.string()),
+    'Int32': pa.int32(),
+    'boolean': pa.bool_(),
+}
+
+# Nullable pandas dtypes for Arrow columns, matching METADATA_SCHEMA
+PANDAS_DTYPES = {
+    pa.string(): pd.StringDtype(),
+    pa.int32(): pd.Int32Dtype(),
+    pa.bool_(): pd.BooleanDtype(),
+}
+
+
+def hash_file(path, block_size=1 << 20):
+    """
+    Return a content hash of a file, read in fixed-size blocks
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, 'rb') as handle:
+        for block in iter(lambda: handle.read(block_size), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _tmp_path(path):
+    """
+    Return a temporary path next to path that no other process or thread writes
+    """
+    return f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+
+
+def _snapshot_hash(schema):
+    """
+    Return the source hash stored in a snapshot's Parquet schema, or None
+    """
+    value = (schema.metadata or {}).get(b'cord19_hash')
+    return value.decode() if value is not None else None
+
+
+def arrow_to_pandas(table, zero_copy=False):
+    """
+    Convert an Arrow table to a DataFrame, keeping the dtypes of METADATA_SCHEMA
+    
+    Columns declared as string[pyarrow] wrap the Arrow buffers directly instead
+    of round-tripping through Python string objects. With zero_copy=True every
+    string column is wrapped that way and numeric columns without nulls are
+    exposed as views, so a memory-mapped table is not copied into the heap.
+    Their dtypes then come from the table's pandas metadata: mapping them to
+    nullable dtypes, as for METADATA_SCHEMA, would copy them.
+    """
+    if zero_copy:
+        arrow_columns = [
+            field.name for field in table.schema
+            if pa.types.is_string(field.type) or pa.types.is_large_string(field.type)
+        ]
+    else:
+        arrow_columns = [
+            name for name in table.column_names
+            if METADATA_SCHEMA.get(name) == 'string[pyarrow]'
+        ]
+    other_columns = [name for name in table.column_names if name not in arrow_columns]
+    frame = table.select(other_columns).to_pandas(
+        split_blocks=zero_copy, types_mapper=None if zero_copy else PANDAS_DTYPES.get
+    )
+    
+    for name in arrow_columns:
+        column = table.column(name)
+        frame.insert(
+            table.column_names.index(name), name,
+            pd.arrays.ArrowStringArray(column.cast('string'))
+        )
+    return frame
+
+
+# Codecs decompressed on the fly, by file extension
+COMPRESSION_CODECS = {'.gz': 'gzip', '.bz2': 'bz2', '.xz': 'xz', '.zst': 'zstd'}
+
+
+class LoadCancelled(Exception):
+    """
+    Raised from inside a read when its cancel event has been set
+    """
+
+
+class _CountingReader(io.RawIOBase):
+    """
+    Raw binary stream that counts the bytes and line breaks read through it
+    
+    on_read, if given, is called after every read.
+    """
+    def __init__(self, raw, on_read=None):
+        self.raw = raw
+        self.on_read = on_read
+        self.bytes_read = 0
+        self.lines_read = 0
+    
+    def readable(self):
+        return True
+    
+    def readinto(self, buffer):
+        data = self.raw.read(len(buffer))
+        n = len(data)
+        buffer[:n] = data
+        self.bytes_read += n
+        self.lines_read += data.count(b'\n')
+        if self.on_read is not None:
+            self.on_read()
+        return n
+    
+    def close(self):
+        self.raw.close()
+        super().close()
+
+
+class MeteredInput:
+    """
+    Buffered binary stream over a metadata file, decompressed on the fly
+    
+    .gz, .bz2, .xz and .zst files are decompressed as they are read, so the
+    parser never needs an uncompressed copy on disk. stats() reports the
+    bytes read on either side of the codec and the throughput so far.
+    
+    progress, if given, is called with progress() at most every
+    progress_interval seconds while the file is read. Setting the cancel
+    event (a threading.Event) makes the next read raise LoadCancelled,
+    which stops the parser reading from this stream.
+    """
+    progress_interval = 0.1
+    
+    def __init__(self, path, buffer_size=1 << 20, progress=None, cancel=None):
+        self.path = path
+        self.codec = COMPRESSION_CODECS.get(os.path.splitext(path)[1].lower())
+        self.total_bytes = os.path.getsize(path)
+        self._progress = progress
+        self._cancel = cancel
+        self._reported = 0.0
+        self._raw = _CountingReader(open(path, 'rb'), on_read=self._on_read)
+        self._started = time.perf_counter()
+        if self.codec is None:
+            self._data = self._raw
+        else:
+            self._data = _CountingReader(self._decompressor())
+        self.stream = io.BufferedReader(self._data, buffer_size=buffer_size)
+    
+    def _decompressor(self):
+        if self.codec == 'gzip':
+            return gzip.GzipFile(fileobj=self._raw)
+        if self.codec == 'bz2':
+            return bz2.BZ2File(self._raw)
+        if self.codec == 'xz':
+            return lzma.LZMAFile(self._raw)
+        try:
+            import zstandard
+        except ImportError:
+            self._raw.close()
+            raise ImportError("reading .zst files requires the zstandard package")
+        return zstandard.ZstdDecompressor().stream_reader(self._raw, read_across_frames=True)
+    
+    def _on_read(self):
+        if self._cancel is not None and self._cancel.is_set():
+            raise LoadCancelled(self.path)
+        if self._progress is not None:
+            now = time.perf_counter()
+            if now - self._reported >= self.progress_interval:
+                self._reported = now
+                self._progress(self.progress())
+    
+    def progress(self):
+        """
+        Return how far reading has got: bytes of the file read, rows (estimated
+        from line breaks) and the estimated seconds remaining
+        """
+        seconds = time.perf_counter() - self._started
+        done = self._raw.bytes_read
+        eta = None
+        if done:
+            eta = seconds * (self.total_bytes - done) / done
+        return {
+            'path': self.path,
+            'bytes': done,
+            'total_bytes': self.total_bytes,
+            'fraction': done / self.total_bytes if self.total_bytes else 1.0,
+            'rows': max(self._data.lines_read - 1, 0),
+            'seconds': seconds,
+            'eta': eta,
+        }
+    
+    def stats(self):
+        """
+        Return bytes read (compressed and decompressed), seconds elapsed and throughput
+        """
+        seconds = time.perf_counter() - self._started
+        compressed = self._raw.bytes_read
+        decompressed = self._data.bytes_read
+        return {
+            'path': self.path,
+            'codec': self.codec or 'none',
+            'compressed_bytes': compressed,
+            'bytes': decompressed,
+            'ratio': decompressed / compressed if compressed else None,
+            'seconds': seconds,
+            'mb_per_s': decompressed / seconds / 1e6 if seconds else None,
+        }
+    
+    def close(self):
+        self.stream.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        self.close()
+
+
+def read_metadata_csv(path, engine='c', block_size=None, threads=None, schema=METADATA_SCHEMA,
+                      stats=None, progress=None, cancel=None):
+    """
+    Parse a metadata CSV with the selected engine ('c', 'python' or 'pyarrow')
+    
+    The pyarrow engine parses blocks of block_size bytes on up to threads
+    cores (all cores by default). If it is unavailable or fails on the file,
+    the C parser is used instead. With schema=None every column is read and
+    types are inferred. Compressed files (.gz, .bz2, .xz, .zst) are
+    decompressed while they are parsed; pass a dict as stats to receive
+    the read throughput (see MeteredInput.stats). progress and cancel are
+    passed on to MeteredInput; a cancelled read raises LoadCancelled.
+    """
+    if engine == 'pyarrow':
+        try:
+            with MeteredInput(path, progress=progress, cancel=cancel) as source:
+                df = _read_csv_pyarrow(source.stream, block_size, threads, schema)
+            if stats is not None:
+                stats.update(source.stats())
+            return df
+        except (FileNotFoundError, ImportError, LoadCancelled):
+            raise
+        except Exception as e:
+            print(f"Warning: pyarrow CSV engine failed ({e}); falling back to the C parser")
+            engine = 'c'
+    
+    with MeteredInput(path, progress=progress, cancel=cancel) as source:
+        if schema is None:
+            df = pd.read_csv(source.stream, engine=engine, low_memory=False)
+        else:
+            df = pd.read_csv(
+                source.stream,
+                engine=engine,
+                usecols=lambda column: column in schema,
+                dtype=schema,
+            )
+    if stats is not None:
+        stats.update(source.stats())
+    return df
+
+
+def _pyarrow_csv_options(stream, block_size, threads, schema):
+    """
+    Return the pyarrow CSV read, parse and convert options for a metadata stream
+    """
+    read_options = pacsv.ReadOptions(use_threads=threads != 1)
+    if block_size:
+        read_options.block_size = block_size
+    # Abstracts may contain quoted line breaks
+    parse_options = pacsv.ParseOptions(newlines_in_values=True)
+    
+    # Empty fields are missing values, as with the pandas parsers
+    convert_options = pacsv.ConvertOptions(strings_can_be_null=True)
+    if schema is not None:
+        # Peek at the header without consuming it from the stream
+        first_line = stream.peek(1 << 16).split(b'\n', 1)[0]
+        header = next(csv.reader([first_line.decode('utf-8-sig').rstrip('\r')]))
+        columns = [column for column in header if column in schema]
+        if not columns:
+            raise ValueError("no metadata columns found in header")
+        convert_options.include_columns = columns
+        convert_options.column_types = {
+            column: ARROW_SCHEMA_TYPES[schema[column]] for column in columns
+        }
+    return {
+        'read_options': read_options,
+        'parse_options': parse_options,
+        'convert_options': convert_options,
+    }
+
+
+# Serializes reads that resize Arrow's process-wide CPU pool
+_ARROW_POOL_LOCK = threading.Lock()
+
+
+def _read_csv_pyarrow(stream, block_size, threads, schema):
+    """
+    Parse a CSV from a buffered binary stream with the multi-threaded pyarrow reader
+    """
+    options = _pyarrow_csv_options(stream, block_size, threads, schema)
+    if threads and threads > 1:
+        # Arrow's CPU pool is process-wide: cap it for this read only, so the
+        # text kernels and later loads get all cores back afterwards
+        with _ARROW_POOL_LOCK:
+            previous = pa.cpu_count()
+            pa.set_cpu_count(threads)
+            try:
+                table = pacsv.read_csv(stream, **options)
+            finally:
+                pa.set_cpu_count(previous)
+    else:
+        table = pacsv.read_csv(stream, **options)
+    if schema is None:
+        return table.to_pandas()
+    return arrow_to_pandas(table)
+
+
+# Common English words left out of word frequency counts
+STOP_WORDS = {'the', 'and', 'of', 'in', 'to', 'a', 'for', 'with', 'on', 'by', 
+              'as', 'an', 'from', 'that', 'this', 'is', 'are', 'was', 'were', 
+              'be', 'been', 'have', 'has', 'had', 'but', 'not', 'at', 'which'}
+
+
+def _arrow_strings(series):
+    """
+    Return a text column as an Arrow string array, or None if it is not text
+    
+    Arrow-backed columns are passed through without copying; categoricals
+    are decoded from their dictionary.
+    """
+    try:
+        array = pa.array(series, from_pandas=True)
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        return None
+    if pa.types.is_dictionary(array.type):
+        array = array.dictionary_decode()
+    if pa.types.is_string(array.type) or pa.types.is_large_string(array.type):
+        return array
+    return None
+
+
+def _map_slices(func, array, chunk_rows):
+    """
+    Apply an Arrow kernel function to chunk_rows slices of array, in row order
+    
+    The slices run on a thread pool when there are several cores, since
+    Arrow's kernels release the GIL.
+    """
+    slices = [array.slice(start, chunk_rows) for start in range(0, len(array), chunk_rows)]
+    if len(slices) > 1 and (os.cpu_count() or 1) > 1:
+        with ThreadPoolExecutor() as pool:
+            return list(pool.map(func, slices))
+    return [func(part) for part in slices]
+
+
+def _count_tokens_arrow(array):
+    """
+    Count whitespace-separated words in an Arrow string array
+    """
+    # Splitting yields empty tokens at leading or trailing whitespace, so trim
+    # first; a value that is empty after trimming has no words
+    trimmed = pc.utf8_trim_whitespace(array)
+    counts = pc.list_value_length(pc.utf8_split_whitespace(trimmed))
+    return pc.if_else(pc.equal(pc.binary_length(trimmed), 0), 0, counts).fill_null(0).to_numpy()
+
+
+def count_tokens(series, chunk_rows=65536):
+    """
+    Return the number of whitespace-separated words per value (0 when missing)
+    
+    Same counts as len(str(x).split()), computed by Arrow's string kernels
+    instead of a Python loop. Large columns are split into chunk_rows slices
+    counted on a thread pool, since the kernels release the GIL. Columns
+    Arrow cannot convert (mixed objects) fall back to pandas' str.split.
+    """
+    array = _arrow_strings(series)
+    if array is None:
+        counts = series.astype(object).where(series.notna(), '').astype(str).str.split().str.len()
+        return pd.Series(counts.to_numpy(dtype='int64'), index=series.index, name=series.name)
+    
+    parts = _map_slices(_count_tokens_arrow, array, chunk_rows)
+    counts = np.concatenate(parts).astype('int64') if parts else np.zeros(0, dtype='int64')
+    return pd.Series(counts, index=series.index, name=series.name)
+
+
+def _value_counts_arrow(array):
+    """
+    Return the distinct values of an Arrow array and their counts as a dict
+    """
+    counts = pc.value_counts(array)
+    return dict(zip(counts.field('values').to_pylist(), counts.field('counts').to_pylist()))
+
+
+def _whitespace_tokens_arrow(array):
+    """
+    Return the non-empty whitespace-separated tokens of an Arrow string array, flattened
+    """
+    tokens = pc.list_flatten(pc.utf8_split_whitespace(array))
+    # Leading or trailing whitespace splits off empty tokens
+    return pc.filter(tokens, pc.greater(pc.binary_length(tokens), 0))
+
+
+def _count_words_arrow(array):
+    """
+    Count lower-cased words of three or more letters in an Arrow string array
+    """
+    # Words never span whitespace, so each distinct whitespace token is matched once
+    tokens = _whitespace_tokens_arrow(array)
+    plain = pc.and_(pc.ascii_is_alpha(tokens), pc.greater_equal(pc.binary_length(tokens), 3))
+    counts = Counter(_value_counts_arrow(pc.ascii_lower(pc.filter(tokens, plain))))
+    
+    # Tokens with punctuation, digits or non-ASCII letters go through re as before;
+    # Python lower-cases some letters differently (U+0130 gains a combining dot)
+    for token, count in _value_counts_arrow(pc.filter(tokens, pc.invert(plain))).items():
+        for word in re.findall(r'\b[a-zA-Z]{3,}\b', token.lower()):
+            counts[word] += count
+    return counts
+
+
+def _count_whitespace_tokens_arrow(array):
+    """
+    Count lower-cased whitespace-separated tokens in an Arrow string array
+    """
+    tokens = _whitespace_tokens_arrow(array)
+    is_ascii = pc.string_is_ascii(tokens)
+    counts = Counter(_value_counts_arrow(pc.ascii_lower(pc.filter(tokens, is_ascii))))
+    # Non-ASCII tokens are lower-cased by Python, once per distinct token
+    for token, count in _value_counts_arrow(pc.filter(tokens, pc.invert(is_ascii))).items():
+        counts[token.lower()] += count
+    return counts
+
+
+def count_words(series, chunk_rows=65536):
+    """
+    Count lower-cased words of three or more letters in a text column
+    
+    Text columns are tokenized by Arrow's kernels on a thread pool, in
+    chunk_rows slices whose counts are added up.
+    """
+    array = _arrow_strings(series)
+    if array is None:
+        text = ' '.join(series.dropna().astype(str))
+        return Counter(re.findall(r'\b[a-zA-Z]{3,}\b', text.lower()))
+    
+    counts = Counter()
+    for part in _map_slices(_count_words_arrow, array, chunk_rows):
+        counts.update(part)
+    return counts
+
+
+def count_whitespace_tokens(series, chunk_rows=65536):
+    """
+    Count lower-cased whitespace-separated tokens in a text column
+    
+    Same counts as splitting the joined, lower-cased text with str.split().
+    """
+    array = _arrow_strings(series)
+    if array is None:
+        return Counter(' '.join(series.dropna().astype(str)).lower().split())
+    
+    counts = Counter()
+    for part in _map_slices(_count_whitespace_tokens_arrow, array, chunk_rows):
+        counts.update(part)
+    return counts
+
+
+def contains_text(series, pattern, case=False, chunk_rows=65536):
+    """
+    Return a boolean mask of the values matching a regular expression (False when missing)
+    
+    Text columns are matched by Arrow's RE2 kernel, which unlike pandas'
+    case-insensitive str.contains does not loop in Python. Patterns RE2
+    cannot compile (backreferences, lookaround) use str.contains instead.
+    """
+    array = _arrow_strings(series)
+    if array is not None:
+        try:
+            parts = _map_slices(
+                lambda part: pc.match_substring_regex(part, pattern, ignore_case=not case).fill_null(False),
+                array, chunk_rows,
+            )
+        except pa.ArrowInvalid:
+            parts = None
+        if parts is not None:
+            mask = np.concatenate([part.to_numpy(zero_copy_only=False) for part in parts]) if parts else np.zeros(0, dtype=bool)
+            return pd.Series(mask, index=series.index, name=series.name)
+    return series.str.contains(pattern, case=case, na=False).astype(bool)
+
+
+# Low-cardinality text columns kept dictionary-encoded from ingest onwards
+CATEGORICAL_COLUMNS = ['journal', 'journal_clean', 'source_x', 'license']
+
+
+def top_counts(series, n=None):
+    """
+    Return value counts of a column, most frequent first, without zero counts
+    
+    Categorical columns are counted over their integer codes; filtered
+    frames keep unused categories, which are dropped here.
+    """
+    counts = series.value_counts()
+    counts = counts[counts > 0]
+    return counts if n is None else counts.head(n)
+
+
+# Dash look-alikes folded to '-' before punctuation is collapsed
+_DASHES = re.compile('[\u2010-\u2015\u2212\ufe58\ufe63]')
+# Anything that is not a word character or a joining mark becomes a separator
+_JOURNAL_SEPARATORS = re.compile(r"[^\w&+'/-]+")
+# Dashes, slashes and apostrophes only count when they sit between words
+# ("Covid-19", not "Cell - Reports"); a lone '&' or '+' is kept as a word
+_LOOSE_JOINERS = re.compile(r"(?<!\w)['/-]+|['/-]+(?!\w)")
+
+
+@lru_cache(maxsize=None)
+def canonical_journal_name(name):
+    """
+    Return the canonical spelling of one journal name
+    
+    The name is NFKC-normalized and casefolded, punctuation and runs of
+    whitespace collapse to single spaces, and the result is title-cased, so
+    'J. Virol.', 'j virol' and 'Ｊ Virol' all become 'J Virol'.
+    Names with nothing left are 'Unknown'. Results are memoized, so each
+    distinct spelling is only worked out once per process.
+    """
+    text = unicodedata.normalize('NFKC', str(name)).casefold()
+    text = _JOURNAL_SEPARATORS.sub(' ', _DASHES.sub('-', text))
+    text = ' '.join(_LOOSE_JOINERS.sub(' ', text).split())
+    if not text:
+        return 'Unknown'
+    # str.title() would also capitalize after an apostrophe ("Children'S")
+    return re.sub(r"'(\w)", lambda m: "'" + m.group(1).lower(), text.title())
+
+
+def normalize_journal_names(journal):
+    """
+    Return canonical journal names, with missing ones as 'Unknown', as a categorical
+    
+    Only the distinct names are canonicalized: they form a table of canonical
+    names, and rows are mapped back through their category codes, so variants
+    that canonicalize alike (e.g. 'PLOS ONE' and 'PLoS One.') share one category.
+    """
+    journal = journal.astype('category')
+    canonical = [canonical_journal_name(name) for name in journal.cat.categories] + ['Unknown']
+    new_codes, categories = pd.factorize(pd.Index(canonical))
+    # Missing journals have code -1, which picks the trailing 'Unknown' entry
+    codes = new_codes[journal.cat.codes.to_numpy()]
+    return pd.Series(
+        pd.Categorical.from_codes(codes, categories=categories),
+        index=journal.index, name=journal.name,
+    )
+
+
+# Bump whenever merge_journal_variants changes so cached alias tables are rebuilt
+JOURNAL_MERGE_VERSION = 3
+# Minimum trigram Jaccard similarity for two journal names to be merged
+JOURNAL_SIMILARITY = 0.7
+# Words ignored when comparing journal names ('Journal Of Virology' ~ 'J Virol')
+JOURNAL_STOP_WORDS = frozenset(['of', 'the', 'and', '&', 'for', 'in', 'on', 'de', 'la', 'et', 'und', 'der'])
+
+
+def _strip_accents(word):
+    """
+    Return word without combining accents ('médical' -> 'medical')
+    """
+    return ''.join(c for c in unicodedata.normalize('NFKD', word) if not unicodedata.combining(c))
+
+
+def _journal_tokens(name):
+    """
+    Return the casefolded words of a journal name without accents or stop words
+    """
+    return tuple(word for word in re.split(r"[\s/+-]+", _strip_accents(name.casefold()))
+                 if word and word not in JOURNAL_STOP_WORDS)
+
+
+def _trigrams(tokens):
+    """
+    Return the set of character trigrams of a tokenized name, padded at the ends
+    """
+    text = f" {' '.join(tokens)} "
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+def _abbreviates(short, long):
+    """
+    Return True if every word of short is a prefix of the matching word of long
+    """
+    return all(word.startswith(prefix) for prefix, word in zip(short, long))
+
+
+def _small_word_edit(a, b):
+    """
+    Return True if two words differ by at most a plural ending or, for words
+    of five letters or more, one dropped, added or swapped letter
+    
+    Substitutions never count: 'Hepatology' and 'Hematology' are different
+    journals that differ by a single letter.
+    """
+    if a == b:
+        return True
+    short, long = sorted((a, b), key=len)
+    if long in (short + 's', short + 'es'):
+        return True
+    if len(short) < 5:
+        return False
+    if len(long) == len(short) + 1:
+        return any(long[:k] + long[k + 1:] == short for k in range(len(long)))
+    if len(long) == len(short):
+        differ = [k for k in range(len(a)) if a[k] != b[k]]
+        return (len(differ) == 2 and differ[1] == differ[0] + 1
+                and a[differ[0]] == b[differ[1]] and a[differ[1]] == b[differ[0]])
+    return False
+
+
+def _spelling_variants(a, b):
+    """
+    Return True if two tokenized journal names can only be spellings of one journal
+    
+    Words are compared pairwise. Every differing pair must be a small edit,
+    and a single-word name may not differ at all ('Vaccine' and 'Vaccines'
+    are different journals).
+    """
+    differing = [(x, y) for x, y in zip(a, b) if x != y]
+    if not differing:
+        return len(a) == len(b)
+    if len(a) < 2:
+        return False
+    return all(_small_word_edit(x, y) for x, y in differing)
+
+
+def journal_aliases(counts, threshold=JOURNAL_SIMILARITY):
+    """
+    Return {variant: canonical name} for journal names that should be merged
+    
+    counts maps journal names (already normalized, see canonical_journal_name)
+    to their number of papers. Two names are linked when
+    
+    - one abbreviates the other word by word ('J Virol', 'Journal Of Virology'),
+      with stop words ignored and at least two words, or
+    - the Jaccard similarity of their character trigrams is at least threshold,
+      their words start with the same letters in the same order ('Virology
+      Journal' stays apart from 'Journal Of Virology'), they contain the
+      same numbers ('Covid-19' never merges with 'Covid-20') and each pair
+      of differing words is a small edit ('Virolgy', but not 'Hematology'
+      for 'Hepatology'; see _spelling_variants).
+    
+    Candidates are found by blocking instead of comparing all pairs: abbreviations
+    are only searched among names with the same word initials, and similar names
+    through an index of each name's rarest trigrams (prefix filtering, which
+    cannot miss a pair above threshold). Linked names form clusters (union-find)
+    named after their most frequent variant; only names that change are returned.
+    An abbreviation whose expansions fall in more than one cluster ('J Appl Phys'
+    for 'Journal Of Applied Physics' and 'Journal Of Applied Physiology') is
+    left unmerged. 'Unknown', which stands for missing journals, is never merged.
+    """
+    names = sorted((name for name in counts if name != 'Unknown'), key=lambda name: (-counts[name], -len(name), name))
+    tokens = [_journal_tokens(name) for name in names]
+    parent = list(range(len(names)))
+    
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+    
+    def union(i, j):
+        i, j = find(i), find(j)
+        # names are sorted most frequent first, so the lower index names the cluster
+        if i != j:
+            parent[max(i, j)] = min(i, j)
+    
+    # Abbreviations: block on word initials, then binary search on the first word.
+    # Expansions are collected here and linked after the spelling variants
+    initials = [tuple(word[0] for word in words) for words in tokens]
+    blocks = {}
+    for i, words in enumerate(tokens):
+        if len(words) >= 2:
+            blocks.setdefault(initials[i], []).append(i)
+    expansions = {}
+    for members in blocks.values():
+        if len(members) < 2:
+            continue
+        members.sort(key=lambda i: tokens[i])
+        firsts = [tokens[i][0] for i in members]
+        for i in members:
+            words = tokens[i]
+            start = bisect_left(firsts, words[0])
+            for position in range(start, len(members)):
+                if not firsts[position].startswith(words[0]):
+                    break
+                j = members[position]
+                if tokens[j] != words and len(' '.join(tokens[j])) > len(' '.join(words)) \
+                        and _abbreviates(words, tokens[j]):
+                    expansions.setdefault(i, []).append(j)
+    
+    # Similar spellings: index each name by its rarest trigrams only
+    grams = [_trigrams(words) for words in tokens]
+    frequency = Counter(gram for name_grams in grams for gram in name_grams)
+    numbers = [frozenset(word for word in words if any(c.isdigit() for c in word)) for words in tokens]
+    index = {}
+    for i in sorted(range(len(names)), key=lambda i: len(grams[i])):
+        ordered = sorted(grams[i], key=lambda gram: (frequency[gram], gram))
+        prefix = len(ordered) - int(np.ceil(threshold * len(ordered))) + 1
+        seen = set()
+        for gram in ordered[:prefix]:
+            for j in index.get(gram, ()):
+                if j in seen:
+                    continue
+                seen.add(j)
+                # Names are visited by size, so j is never the larger of the two
+                if len(grams[j]) < threshold * len(grams[i]) \
+                        or initials[i] != initials[j] or numbers[i] != numbers[j]:
+                    continue
+                shared = len(grams[i] & grams[j])
+                if shared >= threshold * (len(grams[i]) + len(grams[j]) - shared) \
+                        and _spelling_variants(tokens[i], tokens[j]):
+                    union(i, j)
+            index.setdefault(gram, []).append(i)
+    
+    # Longer abbreviations join their cluster first, so 'J Appl Physics' is
+    # counted with 'Journal Of Applied Physics' when 'J Appl Phys' is resolved
+    for i in sorted(expansions, key=lambda i: -len(' '.join(tokens[i]))):
+        clusters = {find(j) for j in expansions[i]}
+        if len(clusters) == 1:
+            union(i, clusters.pop())
+    
+    return {name: names[find(i)] for i, name in enumerate(names) if find(i) != i}
+
+
+def merge_journal_variants(journal, aliases):
+    """
+    Return a categorical of journal names with each variant replaced by its alias
+    """
+    journal = journal.astype('category')
+    merged = [aliases.get(name, name) for name in journal.cat.categories]
+    new_codes, categories = pd.factorize(pd.Index(merged))
+    codes = journal.cat.codes.to_numpy()
+    codes = np.where(codes >= 0, new_codes[codes], -1)
+    return pd.Series(
+        pd.Categorical.from_codes(codes, categories=categories),
+        index=journal.index, name=journal.name,
+    )
+
+
+def load_journal_aliases(counts, path=None):
+    """
+    Return journal_aliases(counts), reusing the table stored at path when it is current
+    
+    The table is stored as JSON together with a key over the name counts and
+    the merge settings, so it is rebuilt only when either changes.
+    """
+    key = _digest(JOURNAL_MERGE_VERSION, JOURNAL_SIMILARITY,
+                  *[f"{name}\t{count}" for name, count in sorted(counts.items())])
+    if path is not None and os.path.exists(path):
+        try:
+            with open(path) as handle:
+                stored = json.load(handle)
+            if stored.get('key') == key:
+                return stored['aliases']
+        except Exception as e:
+            print(f"Warning: ignoring unreadable cache: {e}")
+    
+    aliases = journal_aliases(counts)
+    if path is not None:
+        try:
+            os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+            tmp_path = _tmp_path(path)
+            with open(tmp_path, 'w') as handle:
+                json.dump({'key': key, 'aliases': aliases}, handle)
+            os.replace(tmp_path, path)
+        except Exception as e:
+            print(f"Warning: could not write cache: {e}")
+    return aliases
+
+
+# publish_time formats found in CORD-19, parsed with an explicit format before
+# falling back to pandas' per-value inference for anything else
+PUBLISH_TIME_FORMATS = [
+    (r'^\d{4}$', '%Y'),
+    (r'^\d{4}-\d{2}-\d{2}$', '%Y-%m-%d'),
+    (r'^\d{4} [A-Z][a-z]{2} \d{1,2}$', '%Y %b %d'),
+]
+
+
+def parse_publish_time(series):
+    """
+    Parse a column of date strings, like pd.to_datetime(series, errors='coerce')
+    
+    Each distinct string is parsed once, so repeated dates cost nothing.
+    The distinct values are grouped by format and each group is parsed
+    vectorized with that format; only unrecognised strings go through
+    pandas' slower inference.
+    """
+    codes, uniques = pd.factorize(series)
+    uniques = pd.Series(np.asarray(uniques, dtype=object)).astype(str)
+    parsed = pd.Series(pd.NaT, index=uniques.index, dtype='datetime64[ns]')
+    
+    remaining = pd.Series(True, index=uniques.index)
+    for pattern, date_format in PUBLISH_TIME_FORMATS:
+        matches = remaining & uniques.str.match(pattern)
+        if matches.any():
+            parsed[matches] = pd.to_datetime(uniques[matches], format=date_format, errors='coerce')
+            remaining &= ~matches
+    if remaining.any():
+        parsed[remaining] = pd.to_datetime(uniques[remaining], errors='coerce')
+    
+    # Missing values have code -1 and stay NaT
+    values = np.full(len(codes), np.datetime64('NaT'), dtype='datetime64[ns]')
+    present = codes >= 0
+    values[present] = parsed.to_numpy()[codes[present]]
+    return pd.Series(values, index=series.index, name=series.name)
+
+
+# One named step of the cleaning pipeline. func takes the frame cleaned so far
+# and returns {column: values} for the columns listed in outputs; bump version
+# whenever func changes so its cached output (and everything downstream) is rebuilt.
+CleaningStage = namedtuple('CleaningStage', ['name', 'inputs', 'outputs', 'func', 'version'])
+
+
+def _parse_dates_stage(frame):
+    # Handle publication date
+    return {'publish_time': parse_publish_time(frame['publish_time'])}
+
+
+def _extract_year_stage(frame):
+    # Extract year from publication date
+    return {'publication_year': frame['publish_time'].dt.year}
+
+
+def _impute_year_stage(frame):
+    # Fill missing years with 2020 (most common year for COVID research)
+    return {'publication_year': frame['publication_year'].fillna(2020)}
+
+
+def _word_count_stage(frame):
+    return {
+        'abstract_word_count': count_tokens(frame['abstract']),
+        'title_word_count': count_tokens(frame['title']),
+    }
+
+
+def _journal_stage(frame):
+    # Clean journal names
+    return {'journal_clean': normalize_journal_names(frame['journal'])}
+
+
+def _categorical_stage(frame):
+    # Frames read without METADATA_SCHEMA arrive with plain string columns
+    return {
+        column: frame[column].astype('category')
+        for column in CATEGORICAL_COLUMNS
+        if column in frame.columns and frame[column].dtype != 'category'
+    }
+
+
+CLEANING_STAGES = [
+    CleaningStage('parse_dates', ['publish_time'], ['publish_time'], _parse_dates_stage, 1),
+    CleaningStage('extract_year', ['publish_time'], ['publication_year'], _extract_year_stage, 1),
+    CleaningStage('impute_year', ['publication_year'], ['publication_year'], _impute_year_stage, 1),
+    CleaningStage('word_counts', ['abstract', 'title'], ['abstract_word_count', 'title_word_count'], _word_count_stage, 1),
+    CleaningStage('normalize_journals', ['journal'], ['journal_clean'], _journal_stage, 2),
+    CleaningStage('encode_categories', ['journal', 'source_x', 'license'], CATEGORICAL_COLUMNS, _categorical_stage, 1),
+]
+
+
+def _digest(*parts):
+    """
+    Return a short stable hash of the given strings
+    """
+    return hashlib.blake2b('|'.join(map(str, parts)).encode(), digest_size=8).hexdigest()
+
+
+def cleaning_versions():
+    """
+    Return the versions that determine df_cleaned for a given input
+    
+    Persisted cleaned data stamped with these is stale once any of them changes.
+    """
+    return {
+        'format': CACHE_FORMAT_VERSION,
+        'stages': {stage.name: stage.version for stage in CLEANING_STAGES},
+        'journal_merge': [JOURNAL_MERGE_VERSION, JOURNAL_SIMILARITY],
+    }
+
+
+def run_cleaning_stages(df, stages=None, data_key=None, load=None, store=None, deferred=(), fetch=None):
+    """
+    Run the cleaning stages over a raw frame and return (cleaned, timings)
+    
+    The result is a shallow overlay: unchanged columns share their arrays with
+    df, and stage outputs are stored as new arrays on the overlay only, so df
+    itself is never modified. Treat the shared columns as read-only (or enable
+    pandas' mode.copy_on_write) before editing in place.
+    
+    With data_key (an identifier of the raw input) each stage gets a key from
+    its name, version and the keys of the columns it reads. load(stage, key)
+    may return previously stored outputs, and store(stage, key, outputs)
+    receives freshly computed ones, so only stages whose inputs or code changed are recomputed.
+    timings lists, per stage, the seconds spent and whether it was cached.
+    
+    deferred names raw columns left out of df; fetch(columns) returns them as
+    a dict of Series and is only called when a stage reading them must run.
+    """
+    stages = CLEANING_STAGES if stages is None else stages
+    cleaned = df.copy(deep=False)
+    column_keys = {column: f"{data_key}:{column}" for column in [*df.columns, *deferred]}
+    timings = []
+    
+    for stage in stages:
+        start = time.perf_counter()
+        key = None
+        outputs = None
+        if data_key is not None:
+            key = _digest(stage.name, stage.version, *[column_keys.get(column) for column in stage.inputs])
+            if load is not None:
+                outputs = load(stage, key)
+        
+        source = 'cached'
+        if outputs is None:
+            source = 'computed'
+            missing = [column for column in stage.inputs
+                       if column in deferred and column not in cleaned.columns]
+            if missing:
+                for column, values in fetch(missing).items():
+                    cleaned[column] = values.array
+            outputs = stage.func(cleaned)
+            if key is not None and store is not None:
+                store(stage, key, outputs)
+        
+        for column, values in outputs.items():
+            # Assign the bare array: cached outputs share the row order but not the index
+            cleaned[column] = getattr(values, 'array', values)
+            column_keys[column] = key
+        timings.append({'stage': stage.name, 'source': source, 'seconds': time.perf_counter() - start})
+    
+    return cleaned, timings
+
+
+def clean_frame(df):
+    """
+    Return a cleaned overlay of a raw metadata frame with the derived analysis columns
+    """
+    return run_cleaning_stages(df)[0]
+
+
+def concat_frames(frames):
+    """
+    Concatenate frames row-wise, keeping shared categorical columns categorical
+    
+    pd.concat falls back to object dtype when categoricals have different
+    categories; here each categorical column is first recoded onto the union
+    of all frames' categories, which only rewrites the integer codes.
+    Numeric and boolean columns stored in different dtypes (e.g. a downcast
+    bool next to a freshly parsed boolean) are cast to the first of their
+    dtypes that holds every frame's values, the first frame's if possible.
+    """
+    frames = [frame.copy(deep=False) for frame in frames]
+    for column in frames[0].columns:
+        columns = [frame[column] for frame in frames if column in frame.columns]
+        if len(columns) < len(frames):
+            continue
+        if not all(isinstance(values.dtype, pd.CategoricalDtype) for values in columns):
+            dtypes = list(dict.fromkeys(values.dtype for values in columns))
+            target = next((dtype for dtype in dtypes
+                           if len(dtypes) > 1 and all(_fits_dtype(values, dtype) for values in columns)), None)
+            if target is not None:
+                for frame in frames:
+                    frame[column] = frame[column].astype(target)
+            continue
+        categories = columns[0].cat.categories
+        for values in columns[1:]:
+            extra = values.cat.categories
+            categories = categories.append(extra[~extra.isin(categories)])
+        for frame in frames:
+            frame[column] = frame[column].cat.set_categories(categories)
+    return pd.concat(frames, ignore_index=True)
+
+
+# Column identifying a paper; rows sharing a value are duplicates
+DEDUP_KEY = 'cord_uid'
+
+
+def dedup_mask(codes, scores):
+    """
+    Return a boolean mask keeping one row per id: the first of its most complete rows
+    
+    codes are integer ids from hashing the key column (-1 where it is
+    missing; such rows are always kept) and scores the number of non-missing
+    fields in each row. Both steps are hash-based, so this runs in linear time.
+    """
+    codes = np.asarray(codes)
+    scores = np.asarray(scores)
+    best = pd.Series(scores).groupby(codes).transform('max').to_numpy()
+    keep = scores == best
+    keep[keep] = ~pd.Series(codes[keep]).duplicated().to_numpy()
+    keep[codes < 0] = True
+    return keep
+
+
+def keep_most_complete(df, key=DEDUP_KEY):
+    """
+    Return a boolean mask keeping the most complete row for each value of key
+    """
+    if key not in df.columns:
+        return np.ones(len(df), dtype=bool)
+    return dedup_mask(pd.factorize(df[key])[0], df.notna().sum(axis=1).to_numpy())
+
+
+# Narrowest dtypes that hold the cleaned analysis columns, applied by downcast_columns
+DOWNCAST_DTYPES = {
+    'publication_year': 'int16',
+    'abstract_word_count': 'int32',
+    'title_word_count': 'int32',
+    'has_full_text': 'bool',
+}
+
+
+def _fits_dtype(values, dtype):
+    """
+    Return True if a numeric or boolean column can be stored as dtype without loss
+    
+    NumPy integer and bool dtypes hold no missing values, and integers must
+    be whole and within range. Other kinds of columns never fit.
+    """
+    dtype = pd.api.types.pandas_dtype(dtype)
+    if values.dtype == dtype:
+        return True
+    if pd.api.types.is_bool_dtype(dtype):
+        if not pd.api.types.is_bool_dtype(values.dtype):
+            return False
+    elif pd.api.types.is_numeric_dtype(dtype):
+        if not pd.api.types.is_numeric_dtype(values.dtype) or pd.api.types.is_bool_dtype(values.dtype):
+            return False
+    else:
+        return False
+    if isinstance(dtype, np.dtype) and dtype.kind in 'biu':
+        if values.isna().any():
+            return False
+        if dtype.kind != 'b' and len(values):
+            limits = np.iinfo(dtype)
+            if values.min() < limits.min or values.max() > limits.max or (values % 1 != 0).any():
+                return False
+    return True
+
+
+def downcast_columns(frame, max_category_ratio=0.5):
+    """
+    Return narrower versions of the columns of frame that can be stored more compactly
+    
+    Columns in DOWNCAST_DTYPES are converted only when every value fits (no
+    missing values, whole numbers within range). Text columns with at most
+    max_category_ratio distinct values per row become categoricals; a column
+    whose first 10,000 rows are all distinct is taken to be unique-valued and
+    skipped without counting the rest.
+    """
+    converted = {}
+    for column, dtype in DOWNCAST_DTYPES.items():
+        if column not in frame.columns or frame[column].dtype == dtype:
+            continue
+        if _fits_dtype(frame[column], dtype):
+            converted[column] = frame[column].astype(dtype)
+    
+    for column in frame.columns:
+        values = frame[column]
+        if isinstance(values.dtype, pd.CategoricalDtype) or not (
+            pd.api.types.is_object_dtype(values.dtype) or pd.api.types.is_string_dtype(values.dtype)
+        ):
+            continue
+        # Identifiers, titles and abstracts are distinct from the first rows on
+        head = values.head(10_000)
+        if len(head) < len(values) and head.nunique(dropna=False) == len(head):
+            continue
+        if values.nunique() > max_category_ratio * len(values):
+            continue
+        converted[column] = values.astype('category')
+    return converted
+
+
+def reservoir_sample(batches, n, seed=None, key_column=None):
+    """
+    Draw a uniform random sample of n rows from a stream of Arrow batches in one pass
+    
+    Every row gets a uniform random key and the n rows with the smallest keys
+    seen so far are kept, which is reservoir sampling applied a batch at a
+    time. Returns (sample table in input order, number of rows seen); the
+    sample is None if there were no batches.
+    
+    With key_column, the key of a row is a seeded hash of its value there, so
+    all rows sharing a value rise or fall together: the sample then holds every
+    row of n distinct values, and the count returned is of distinct values
+    (each row with a missing value counting once). Counting keeps 8 bytes per
+    distinct value.
+    """
+    rng = np.random.default_rng(seed)
+    hash_key = ''.join(rng.choice(list('0123456789abcdef'), 16)) if key_column else None
+    reservoir = None
+    keys = np.empty(0)
+    # Largest key in a full reservoir; only rows at or below it can enter
+    threshold = np.inf
+    seen = 0
+    hashes = []
+    for batch in batches:
+        if key_column is None or key_column not in batch.schema.names:
+            batch_keys = rng.random(batch.num_rows)
+            seen += batch.num_rows
+        else:
+            values = np.asarray(batch.column(key_column).to_numpy(zero_copy_only=False), dtype=object)
+            missing = pd.isna(values)
+            value_hashes = pd.util.hash_array(values[~missing], hash_key=hash_key)
+            batch_keys = np.empty(batch.num_rows)
+            batch_keys[~missing] = (value_hashes >> np.uint64(11)) * 2.0 ** -53
+            batch_keys[missing] = rng.random(int(missing.sum()))
+            seen += int(missing.sum())
+            hashes.append(np.unique(value_hashes))
+            if len(hashes) > 64:
+                hashes = [np.unique(np.concatenate(hashes))]
+        
+        if threshold < np.inf:
+            beats = batch_keys <= threshold
+            batch, batch_keys = batch.filter(pa.array(beats)), batch_keys[beats]
+        
+        table = pa.Table.from_batches([batch]) if isinstance(batch, pa.RecordBatch) else batch
+        reservoir = table if reservoir is None else pa.concat_tables([reservoir, table])
+        keys = np.concatenate([keys, batch_keys])
+        distinct = np.unique(keys)
+        if len(distinct) >= n:
+            threshold = distinct[n - 1]
+        if len(distinct) > n:
+            # Sorted positions keep the sample in input order
+            keep = np.flatnonzero(keys <= threshold)
+            reservoir = reservoir.take(keep)
+            keys = keys[keep]
+    if hashes:
+        seen += len(np.unique(np.concatenate(hashes)))
+    return reservoir, seen
+
+
+class CorpusAggregates:
+    """
+    Running totals behind the analyze_* methods, built from cleaned chunks
+    
+    alias_path is where journal_series keeps its table of merged journal
+    names (see load_journal_aliases); None keeps it in memory only.
+    """
+    def __init__(self, alias_path=None):
+        self.alias_path = alias_path
+        self._aliases = None
+        self.total_papers = 0
+        self.papers_with_abstract = 0
+        self.papers_with_full_text = 0
+        self.abstract_word_total = 0
+        self.year_counts = Counter()
+        self.journal_counts = Counter()
+        self.source_counts = Counter()
+        self.title_words = Counter()
+        self.abstract_words = Counter()
+        self.columns = set()
+    
+    def add(self, chunk, sign=1):
+        """
+        Fold one cleaned chunk into the running totals (sign=-1 takes it back out)
+        """
+        def fold(counter, counts):
+            if sign > 0:
+                counter.update(counts)
+            else:
+                counter.subtract(counts)
+        
+        self.columns.update(chunk.columns)
+        self.total_papers += sign * len(chunk)
+        self.papers_with_abstract += sign * int(chunk['abstract'].notna().sum())
+        self.abstract_word_total += sign * int(chunk['abstract_word_count'].sum())
+        if 'has_full_text' in chunk.columns:
+            self.papers_with_full_text += sign * int(chunk['has_full_text'].sum())
+        
+        # Chunks with missing years parse them as floats; keep int keys as in df_cleaned
+        fold(self.year_counts, {int(year): count for year, count in chunk['publication_year'].value_counts().items()})
+        # Spelling variants are merged over the whole corpus in journal_series
+        fold(self.journal_counts, normalize_journal_names(chunk['journal']).value_counts().to_dict())
+        if 'source_x' in chunk.columns:
+            fold(self.source_counts, chunk['source_x'].value_counts().to_dict())
+        
+        fold(self.title_words, count_words(chunk['title']))
+        fold(self.abstract_words, count_words(chunk['abstract']))
+    
+    def remove(self, chunk):
+        """
+        Take a previously added cleaned chunk back out of the running totals
+        """
+        self.add(chunk, sign=-1)
+    
+    def year_series(self):
+        """
+        Return publication counts per year, sorted by year
+        """
+        return pd.Series(self.year_counts, name='publication_year', dtype='int64').sort_index()
+    
+    def journal_series(self):
+        """
+        Return publication counts per cleaned journal name, most frequent first
+        
+        Variants of one journal are merged as in CORD19Analyzer.clean_data.
+        """
+        counts = pd.Series(self.journal_counts, name='journal_clean', dtype='int64')
+        counts = counts[counts > 0]
+        names = counts.to_dict()
+        if self._aliases is None or self._aliases[0] != names:
+            self._aliases = (names, load_journal_aliases(names, self.alias_path))
+        counts = counts.groupby(lambda name: self._aliases[1].get(name, name), sort=False).sum()
+        return counts.rename('journal_clean').sort_values(ascending=False, kind='stable')
+    
+    def source_series(self):
+        """
+        Return publication counts per source, most frequent first
+        """
+        counts = pd.Series(self.source_counts, name='source_x', dtype='int64')
+        return counts[counts > 0].sort_values(ascending=False, kind='stable')
+    
+    def summary(self):
+        """
+        Return the same summary dictionary as CORD19Analyzer.get_summary_statistics
+        """
+        years = [year for year, count in self.year_counts.items() if count > 0]
+        return {
+            'total_papers': self.total_papers,
+            'papers_with_abstract': self.papers_with_abstract,
+            'papers_with_full_text': self.papers_with_full_text if 'has_full_text' in self.columns else 'N/A',
+            'earliest_publication': min(years) if years else np.nan,
+            'latest_publication': max(years) if years else np.nan,
+            'avg_abstract_length': self.abstract_word_total / self.total_papers if self.total_papers else np.nan,
+            'unique_journals': len(self.journal_series()),
+            'unique_sources': len(self.source_series()) if 'source_x' in self.columns else 'N/A'
+        }
+
+
+def resolve_paths(file_path):
+    """
+    Expand a path, glob pattern or list of paths into a list of file paths
+    """
+    if isinstance(file_path, (list, tuple)):
+        return list(file_path)
+    if glob.has_magic(file_path):
+        return sorted(glob.glob(file_path))
+    return [file_path]
+
+
 class CORD19Analyzer:
-    def __init__(self, file_path='metadata.csv'):
+    def __init__(self, file_path='metadata.csv', cache_dir='.cord19_cache', lazy_columns=(), dedup=True):
         """
         Initialize the analyzer with the dataset path
+
+        file_path may also be a glob pattern or a list of metadata shards (for
+        example one CSV per release), which load_data reads in parallel.
+        cache_dir holds columnar snapshots of the parsed CSV; pass None to disable caching.
+        lazy_columns (e.g. ['abstract']) are left out when loading from a
+        snapshot and read from it on first use; see ensure_columns().
+        With dedup, rows repeating a cord_uid are dropped on ingest, keeping
+        the most complete one; duplicates_dropped records how many.
+        load_error holds the exception that made the last load_data() fail.
         """
-        self.file_path = file_path
+        self.file_paths = resolve_paths(file_path)
+        self.file_path = self.file_paths[0] if len(self.file_paths) == 1 else file_path
+        self.cache_dir = cache_dir
         self.df = None
         self.df_cleaned = None
+        self.aggregates = None
+        self.content_hash = None
+        self.stage_timings = None
+        self.last_update = None
+        self.load_stats = []
+        self._stage_cache = {}
+        self._shard_derived = None
+        self.is_sample = False
+        self.population_size = None
+        self.dedup = dedup
+        self.duplicates_dropped = 0
+        self.load_error = None
+        self.lazy_columns = list(lazy_columns)
+        self.deferred_columns = []
+        self._column_lock = threading.Lock()
+        self.frozen = False
         
-    def load_data(self):
+    def _cache_name(self):
+        """
+        Return the prefix of cache files for file_path and the ingest options
+        
+        Releases are often laid out as releases/*/metadata.csv, so the name
+        carries a digest of the absolute path besides the file name.
+        """
+        name = f"{os.path.basename(self.file_path)}.{_digest(os.path.abspath(self.file_path))}"
+        return name + '.dedup' if self.dedup else name
+    
+    def _snapshot_paths(self):
+        """
+        Return the (data, metadata) paths of the cached snapshot for file_path
+        """
+        base = os.path.join(self.cache_dir, self._cache_name())
+        return base + '.parquet', base + '.json'
+    
+    def _fresh_snapshot_hash(self):
+        """
+        Return the content hash recorded for a still-fresh snapshot, or None
+        
+        The snapshot is stale when the CSV size changed, or when its mtime changed
+        and the content hash no longer matches.
+        """
+        data_path, meta_path = self._snapshot_paths()
+        if not (os.path.exists(data_path) and os.path.exists(meta_path)):
+            return None
+        
+        with open(meta_path) as handle:
+            meta = json.load(handle)
+        stat = os.stat(self.file_path)
+        if meta.get('format') != CACHE_FORMAT_VERSION or meta.get('size') != stat.st_size:
+            return None
+        
+        if meta.get('mtime_ns') != stat.st_mtime_ns:
+            # File was touched or rewritten: only the content hash can tell
+            if hash_file(self.file_path) != meta.get('hash'):
+                return None
+            meta['mtime_ns'] = stat.st_mtime_ns
+            tmp_path = _tmp_path(meta_path)
+            with open(tmp_path, 'w') as handle:
+                json.dump(meta, handle)
+            os.replace(tmp_path, meta_path)
+        return meta['hash']
+    
+    def _read_snapshot(self):
+        """
+        Return the cached snapshot as a DataFrame, or None if it is missing or stale
+        """
+        content_hash = self._fresh_snapshot_hash()
+        if content_hash is None:
+            return None
+        data_path, meta_path = self._snapshot_paths()
+        schema = pq.read_schema(data_path)
+        if _snapshot_hash(schema) != content_hash:
+            # Data and sidecar come from different writes; treat as stale
+            return None
+        self.content_hash = content_hash
+        with open(meta_path) as handle:
+            self.duplicates_dropped = json.load(handle).get('duplicates_dropped', 0)
+        names = schema.names
+        self.deferred_columns = [column for column in names if column in self.lazy_columns]
+        columns = [column for column in names if column not in self.deferred_columns]
+        return arrow_to_pandas(pq.read_table(data_path, columns=columns))
+    
+    def _write_snapshot(self):
+        """
+        Write self.df to the snapshot cache, keyed by the CSV size, mtime and hash
+        """
+        data_path, meta_path = self._snapshot_paths()
+        stat = os.stat(self.file_path)
+        self.content_hash = hash_file(self.file_path)
+        meta = {
+            'format': CACHE_FORMAT_VERSION,
+            'size': stat.st_size,
+            'mtime_ns': stat.st_mtime_ns,
+            'hash': self.content_hash,
+            'duplicates_dropped': self.duplicates_dropped,
+        }
+        
+        os.makedirs(self.cache_dir, exist_ok=True)
+        # The hash is also stored in the Parquet file, so a reader can tell
+        # when the data and the sidecar come from different writers
+        table = pa.Table.from_pandas(self.df, preserve_index=False)
+        metadata = dict(table.schema.metadata or {})
+        metadata[b'cord19_hash'] = self.content_hash.encode()
+        table = table.replace_schema_metadata(metadata)
+        
+        # Write to temporary files first so a crash never leaves a half-written cache
+        tmp_path = _tmp_path(data_path)
+        pq.write_table(table, tmp_path)
+        os.replace(tmp_path, data_path)
+        tmp_path = _tmp_path(meta_path)
+        with open(tmp_path, 'w') as handle:
+            json.dump(meta, handle)
+        os.replace(tmp_path, meta_path)
+    
+    def _fetch_columns(self, columns):
+        """
+        Read deferred columns from the snapshot into df and return them as Series
+        """
+        table = pq.read_table(self._snapshot_paths()[0], columns=columns)
+        if _snapshot_hash(table.schema) != self.content_hash:
+            raise RuntimeError("snapshot was rewritten since it was loaded")
+        fetched = arrow_to_pandas(table)
+        
+        # Swap in a new overlay so readers of the previous frame are unaffected
+        df = self.df.copy(deep=False)
+        for column in columns:
+            df[column] = fetched[column].array
+        self.df = df
+        self.deferred_columns = [column for column in self.deferred_columns if column not in columns]
+        return {column: fetched[column] for column in columns}
+    
+    def ensure_columns(self, *columns):
+        """
+        Load deferred columns on first use and return df_cleaned with them
+        
+        Safe to call on a frozen analyzer: df and df_cleaned are replaced by new
+        overlays, so frames already handed out keep their columns unchanged.
+        Returns None if the columns can no longer be read from the snapshot.
+        """
+        with self._column_lock:
+            missing = [column for column in columns if column in self.deferred_columns]
+            if not missing:
+                return self.df_cleaned
+            try:
+                fetched = self._fetch_columns(missing)
+            except Exception as e:
+                print(f"Error loading columns {missing}: {e}")
+                return None
+            if self.df_cleaned is not None:
+                cleaned = self.df_cleaned.copy(deep=False)
+                for column, values in fetched.items():
+                    cleaned[column] = values.array
+                self.df_cleaned = cleaned
+            print(f"Loaded deferred columns: {', '.join(missing)}")
+        return self.df_cleaned
+    
+    def _null_count(self, column):
+        """
+        Return the number of missing values in a column of df_cleaned
+        
+        Deferred columns are counted from the snapshot's Parquet statistics
+        without reading their values.
+        """
+        if column not in self.deferred_columns:
+            return int(self.df_cleaned[column].isna().sum())
+        metadata = pq.ParquetFile(self._snapshot_paths()[0]).metadata
+        if _snapshot_hash(metadata.schema.to_arrow_schema()) != self.content_hash:
+            return int(self.ensure_columns(column)[column].isna().sum())
+        index = metadata.schema.names.index(column)
+        total = 0
+        for group in range(metadata.num_row_groups):
+            statistics = metadata.row_group(group).column(index).statistics
+            if statistics is None or not statistics.has_null_count:
+                return int(self.ensure_columns(column)[column].isna().sum())
+            total += statistics.null_count
+        return total
+    
+    def missing_values(self):
+        """
+        Return the number of missing values per column of df_cleaned, including deferred columns
+        """
+        counts = self.df_cleaned.isnull().sum()
+        for column in self.deferred_columns:
+            counts[column] = self._null_count(column)
+        return counts
+    
+    def _stage_path(self, stage, stage_key):
+        """
+        Return the path of the cached output of one cleaning stage run
+        """
+        return os.path.join(self.cache_dir, f"{self._cache_name()}.{stage.name}.{stage_key}.parquet")
+    
+    def _load_stage(self, stage, stage_key):
+        """
+        Return the stored outputs of a cleaning stage run, from memory or cache_dir
+        """
+        if stage_key in self._stage_cache:
+            return self._stage_cache[stage_key]
+        path = self.cache_dir and self._stage_path(stage, stage_key)
+        if path is None or not os.path.exists(path):
+            return None
+        try:
+            frame = arrow_to_pandas(pq.read_table(path))
+        except Exception as e:
+            print(f"Warning: ignoring unreadable cache: {e}")
+            return None
+        outputs = {column: frame[column] for column in frame.columns}
+        self._stage_cache[stage_key] = outputs
+        return outputs
+    
+    def _store_stage(self, stage, stage_key, outputs):
+        """
+        Keep the outputs of a cleaning stage run in memory and, if enabled, in cache_dir
+        """
+        self._stage_cache[stage_key] = outputs
+        if self.cache_dir is None or not outputs:
+            return
+        try:
+            path = self._stage_path(stage, stage_key)
+            frame = pd.DataFrame({column: values.array for column, values in outputs.items()})
+            tmp_path = _tmp_path(path)
+            frame.to_parquet(tmp_path, index=False)
+            os.replace(tmp_path, path)
+            
+            # Earlier runs of this stage (other inputs or versions) are superseded
+            pattern = self._stage_path(stage, '*').replace(
+                self._cache_name(), glob.escape(self._cache_name()), 1
+            )
+            for old_path in glob.glob(pattern):
+                if old_path != path:
+                    os.remove(old_path)
+        except Exception as e:
+            print(f"Warning: could not write cache: {e}")
+    
+    def _journal_alias_path(self):
+        """
+        Return the path of the cached journal alias table, or None without cache_dir
+        """
+        if self.cache_dir is None:
+            return None
+        if len(self.file_paths) == 1:
+            name = self._cache_name()
+        else:
+            name = f"shards-{_digest(*map(os.path.abspath, self.file_paths))}"
+        return os.path.join(self.cache_dir, f"{name}.journal_aliases.json")
+    
+    def _merge_journals(self):
+        """
+        Merge spelling variants of journal names in df_cleaned['journal_clean']
+        
+        The clusters depend on every name in the corpus, so this runs after the
+        per-row cleaning stages, over the counts of the normalized names.
+        """
+        journal = self.df_cleaned['journal_clean']
+        counts = top_counts(journal).to_dict()
+        start = time.perf_counter()
+        aliases = load_journal_aliases(counts, self._journal_alias_path())
+        self.df_cleaned['journal_clean'] = merge_journal_variants(journal, aliases).array
+        print(f"  merge_journals: {len(aliases)} of {len(counts)} journal names merged "
+              f"in {time.perf_counter() - start:.3f}s")
+    
+    def load_cleaned(self):
+        """
+        Load df and df_cleaned from the cache, without parsing the CSV
+        
+        Cleaning stages whose outputs are cached for this input and stage
+        version are not recomputed. Returns False when there is no fresh
+        snapshot of the CSV (or several shards are configured).
+        """
+        if self.frozen or self.cache_dir is None or len(self.file_paths) != 1:
+            return False
+        try:
+            df = self._read_snapshot()
+        except Exception as e:
+            print(f"Warning: ignoring unreadable cache: {e}")
+            return False
+        if df is None:
+            return False
+        
+        self.df = df
+        self.is_sample = False
+        print(f"Dataset loaded from cache: {self.df.shape[0]} rows, {self.df.shape[1]} columns")
+        return self.clean_data() is not None
+    
+    def load_data(self, use_cache=True, engine='c', block_size=None, threads=None, max_workers=None,
+                  progress=None, cancel=None):
         """
         Load the metadata.csv file into a pandas DataFrame
+        
+        The first load writes a Parquet snapshot to cache_dir; later loads read
+        the snapshot instead of re-parsing the CSV while it is still fresh.
+        engine selects the CSV parser ('c', 'python' or the multi-threaded
+        'pyarrow'); block_size and threads tune the pyarrow parser.
+        With several shards, up to max_workers processes each parse and clean one.
+        Compressed files are decompressed while they are parsed; load_stats
+        records the read throughput of every file parsed.
+        For a single file, progress is called with MeteredInput.progress()
+        while the CSV is parsed, and setting the cancel event (a
+        threading.Event) stops the parse and returns False.
         """
+        if self.frozen:
+            print("Error: analyzer is frozen and cannot be reloaded")
+            return False
+        self._shard_derived = None
+        self.load_stats = []
+        self.deferred_columns = []
+        self.is_sample = False
+        self.duplicates_dropped = 0
+        self.load_error = None
+        if len(self.file_paths) != 1:
+            return self._load_shards(use_cache, engine, block_size, threads, max_workers)
+        
+        use_cache = use_cache and self.cache_dir is not None
         try:
-            self.df = pd.read_csv(self.file_path)
+            if use_cache:
+                try:
+                    cached = self._read_snapshot()
+                except Exception as e:
+                    print(f"Warning: ignoring unreadable cache: {e}")
+                    cached = None
+                if cached is not None:
+                    self.df = cached
+                    print(f"Dataset loaded from cache: {self.df.shape[0]} rows, {self.df.shape[1]} columns")
+                    return True
+            
+            stats = {}
+            self.df = read_metadata_csv(
+                self.file_path, engine=engine, block_size=block_size, threads=threads,
+                stats=stats, progress=progress, cancel=cancel,
+            )
+            self._record_throughput(stats)
+            self.df = self._deduplicate(self.df)
             print(f"Dataset loaded successfully: {self.df.shape[0]} rows, {self.df.shape[1]} columns")
+            
+            if use_cache:
+                try:
+                    self._write_snapshot()
+                except Exception as e:
+                    print(f"Warning: could not write cache: {e}")
             return True
-        except FileNotFoundError:
+        except FileNotFoundError as e:
             print(f"Error: File {self.file_path} not found.")
+            self.load_error = e
+            return False
+        except LoadCancelled as e:
+            print(f"Loading {self.file_path} was cancelled")
+            self.load_error = e
+            return False
+        except Exception as e:
+            print(f"Error loading data: {e}")
+            self.load_error = e
+            return False
+    
+    def _deduplicate(self, df):
+        """
+        Drop rows repeating a cord_uid (if dedup is on), keeping the most complete one
+        """
+        if not self.dedup:
+            return df
+        keep = keep_most_complete(df)
+        dropped = int((~keep).sum())
+        self.duplicates_dropped += dropped
+        if not dropped:
+            return df
+        print(f"Dropped {dropped} duplicate {DEDUP_KEY} rows")
+        return df[keep].reset_index(drop=True)
+    
+    def load_sample(self, n=5000, block_size=None, seed=None, progress=None, cancel=None):
+        """
+        Load and clean a uniform random sample of n rows for a quick preview
+        
+        Rows are reservoir-sampled while the CSV (or each shard in turn) is
+        streamed through the pyarrow reader in blocks of block_size bytes, so
+        memory stays bounded by n rows plus one block and nothing beyond the
+        sample is converted or cleaned. With dedup, n distinct cord_uids are
+        sampled and only their most complete rows kept, and population_size
+        counts distinct papers, as load_data would. The analyze_* methods
+        label their results as approximate until load_data replaces the sample.
+        progress and cancel work as in load_data.
+        """
+        if self.frozen:
+            print("Error: analyzer is frozen and cannot be reloaded")
+            return False
+        
+        def batches():
+            for path in self.file_paths:
+                with MeteredInput(path, progress=progress, cancel=cancel) as source:
+                    options = _pyarrow_csv_options(source.stream, block_size, None, METADATA_SCHEMA)
+                    yield from pacsv.open_csv(source.stream, **options)
+                    self._record_throughput(source.stats())
+        
+        self._shard_derived = None
+        self.load_stats = []
+        self.deferred_columns = []
+        try:
+            key_column = DEDUP_KEY if self.dedup else None
+            sample, seen = reservoir_sample(batches(), n, seed, key_column=key_column)
+        except FileNotFoundError as e:
+            print(f"Error: File {e.filename or self.file_path} not found.")
+            return False
+        except LoadCancelled as e:
+            print(f"Sampling {e} was cancelled")
+            return False
+        except Exception as e:
+            print(f"Error sampling data: {e}")
+            return False
+        if sample is None:
+            print(f"Error: no files match {self.file_path}")
+            return False
+        
+        # A sample has no content hash, so its cleaning stages are never cached
+        self.duplicates_dropped = 0
+        self.df = self._deduplicate(arrow_to_pandas(sample))
+        self.content_hash = None
+        self.is_sample = True
+        self.population_size = seen
+        print(f"Sampled {len(self.df)} of {seen} {'papers' if self.dedup else 'rows'}")
+        return self.clean_data() is not None
+    
+    def _approximate(self, title):
+        """
+        Mark a chart title as approximate when the analyzer holds a sample
+        """
+        if not self.is_sample:
+            return title
+        return f"{title}\n(approximate: {len(self.df_cleaned):,}-row sample of {self.population_size:,})"
+    
+    def _load_shards(self, use_cache, engine, block_size, threads, max_workers):
+        """
+        Parse and clean every shard in a process pool and concatenate the results
+        
+        Each worker uses the per-file caches in cache_dir. Categorical columns are
+        merged onto shared dictionaries; the derived columns are kept for clean_data.
+        """
+        if not self.file_paths:
+            print(f"Error: no files match {self.file_path}")
+            return False
+        
+        cache_dir = self.cache_dir if use_cache else None
+        try:
+            with ProcessPoolExecutor(max_workers=max_workers) as pool:
+                results = list(pool.map(
+                    _load_and_clean_shard, self.file_paths,
+                    repeat(cache_dir), repeat(engine), repeat(block_size), repeat(threads),
+                    repeat(self.dedup),
+                ))
+        except FileNotFoundError as e:
+            print(f"Error: File {e} not found.")
+            self.load_error = e
+            return False
+        except Exception as e:
+            print(f"Error loading data: {e}")
+            self.load_error = e
+            return False
+        
+        self.df = concat_frames([raw for raw, _, _, _ in results])
+        self._shard_derived = concat_frames([derived for _, derived, _, _ in results])
+        self.load_stats = [stats for _, _, shard_stats, _ in results for stats in shard_stats]
+        
+        # Shards are de-duplicated on their own; drop ids repeated across them as well
+        self.duplicates_dropped = sum(dropped for _, _, _, dropped in results)
+        if self.dedup:
+            keep = keep_most_complete(self.df)
+            if not keep.all():
+                dropped = int((~keep).sum())
+                print(f"Dropped {dropped} {DEDUP_KEY} rows duplicated across files")
+                self.duplicates_dropped += dropped
+                self.df = self.df[keep].reset_index(drop=True)
+                self._shard_derived = self._shard_derived[keep].reset_index(drop=True)
+        print(f"Dataset loaded from {len(self.file_paths)} files: {self.df.shape[0]} rows, {self.df.shape[1]} columns")
+        return True
+    
+    def _record_throughput(self, stats):
+        """
+        Append the read statistics of one file to load_stats and print them
+        """
+        self.load_stats.append(stats)
+        ratio = f", ratio {stats['ratio']:.1f}x" if stats['codec'] != 'none' else ''
+        print(f"Read {stats['bytes'] / 1e6:.1f} MB from {os.path.basename(stats['path'])} "
+              f"({stats['codec']}{ratio}) in {stats['seconds']:.2f}s: {stats['mb_per_s']:.1f} MB/s")
+    
+    def _derived_columns(self):
+        """
+        Return the columns clean_data added to df_cleaned or converted from df
+        
+        Without df (after open_arrow) every column of df_cleaned counts as derived.
+        """
+        if self.df is None:
+            return list(self.df_cleaned.columns)
+        return [
+            column for column in self.df_cleaned.columns
+            if column not in self.df.columns
+            or self.df_cleaned[column].dtype != self.df[column].dtype
+        ]
+    
+    def _overlay(self, derived):
+        """
+        Return df overlaid with the columns of derived, which share its row order
+        """
+        cleaned = self.df.copy(deep=False)
+        for column in derived.columns:
+            cleaned[column] = derived[column].array
+        return cleaned
+    
+    def downcast(self, max_category_ratio=0.5):
+        """
+        Store df_cleaned in the narrowest dtypes that hold its values (see downcast_columns)
+        
+        Columns df_cleaned shares with df are converted in both, so they stay
+        shared. Called by clean_data and update_data; returns the bytes saved.
+        """
+        if self.df_cleaned is None:
+            print("Please clean data first using clean_data()")
+            return 0
+        converted = downcast_columns(self.df_cleaned, max_category_ratio)
+        if not converted:
+            return 0
+        
+        before = self.df_cleaned.memory_usage(deep=True).sum()
+        derived = self._derived_columns()
+        df = self.df.copy(deep=False) if self.df is not None else None
+        cleaned = self.df_cleaned.copy(deep=False)
+        for column, values in converted.items():
+            cleaned[column] = values.array
+            if column not in derived:
+                df[column] = values.array
+        self.df, self.df_cleaned = df, cleaned
+        
+        saved = before - cleaned.memory_usage(deep=True).sum()
+        print(f"Downcast {', '.join(converted)}: saved {saved / 1e6:.1f} MB")
+        return saved
+    
+    def memory_report(self):
+        """
+        Return the deep memory use in bytes and the dtype of every column of df and df_cleaned
+        
+        shared marks columns df_cleaned takes over from df unchanged; they are
+        counted in both frames but stored only once.
+        """
+        frames = {name: frame for name, frame in (('df', self.df), ('df_cleaned', self.df_cleaned))
+                  if frame is not None}
+        if not frames:
+            print("Please load data first using load_data()")
+            return
+        
+        report = pd.DataFrame({
+            f'{name}_{part}': values
+            for name, frame in frames.items()
+            for part, values in (
+                ('dtype', frame.dtypes.astype(str)),
+                ('bytes', frame.memory_usage(index=False, deep=True)),
+            )
+        })
+        if len(frames) == 2:
+            derived = self._derived_columns()
+            report['shared'] = [
+                column in self.df.columns and column in self.df_cleaned.columns and column not in derived
+                for column in report.index
+            ]
+        report = report.sort_values(f'{list(frames)[-1]}_bytes', ascending=False)
+        
+        for name in frames:
+            print(f"{name}: {report[f'{name}_bytes'].sum() / 1e6:.1f} MB")
+        if 'shared' in report.columns:
+            print(f"shared between both: {report.loc[report['shared'], 'df_bytes'].sum() / 1e6:.1f} MB")
+        return report
+    
+    def update_data(self, new_path):
+        """
+        Bring df and df_cleaned up to a new metadata.csv release incrementally
+        
+        Rows of the new file are matched to the loaded ones by a hash of their
+        contents, including cord_uid. Only added or changed rows are cleaned;
+        unchanged rows keep their cleaned values, and self.aggregates (if
+        streamed) is patched by taking out removed rows and adding new ones.
+        Kept rows stay in their previous order with new rows appended.
+        """
+        if self.frozen:
+            print("Error: analyzer is frozen and cannot be reloaded")
+            return False
+        if self.df_cleaned is None:
+            print("Please clean data first using clean_data()")
+            return False
+        if self.is_sample:
+            print("Error: load the full dataset with load_data() before updating it")
+            return False
+        if self.df is None:
+            print("Error: the raw rows are not loaded; use load_data() before updating")
+            return False
+        # Rows are matched on all columns, so deferred ones must be loaded
+        if self.ensure_columns(*self.deferred_columns) is None:
+            return False
+        
+        try:
+            stats = {}
+            new_df = read_metadata_csv(new_path, stats=stats)
+            self._record_throughput(stats)
+            self.duplicates_dropped = 0
+            new_df = self._deduplicate(new_df)
+        except FileNotFoundError:
+            print(f"Error: File {new_path} not found.")
             return False
         except Exception as e:
             print(f"Error loading data: {e}")
             return False
+        
+        # Hash the columns both releases share; categoricals hash by value, not code
+        columns = [column for column in self.df.columns if column in new_df.columns]
+        old_hashes = pd.util.hash_pandas_object(self.df[columns], index=False)
+        new_hashes = pd.util.hash_pandas_object(new_df[columns], index=False)
+        kept = old_hashes.isin(new_hashes).to_numpy()
+        added = ~new_hashes.isin(old_hashes).to_numpy()
+        
+        old_ids = set(self.df.loc[~kept, 'cord_uid'].dropna())
+        new_ids = new_df.loc[added, 'cord_uid']
+        changed = int(new_ids.isin(old_ids).sum())
+        self.last_update = {
+            'added': int(added.sum()) - changed,
+            'changed': changed,
+            'removed': int((~kept).sum()) - changed,
+            'unchanged': int(kept.sum()),
+        }
+        
+        # Clean only the new rows, then carry the derived columns of kept rows over
+        added_raw = new_df[added].reset_index(drop=True)
+        added_cleaned = clean_frame(added_raw)
+        derived = self._derived_columns()
+        
+        if self.aggregates is not None:
+            self.aggregates.remove(self.df_cleaned[~kept])
+            self.aggregates.add(added_cleaned)
+        
+        self.df = concat_frames([self.df[kept], added_raw])
+        self.df_cleaned = self._overlay(
+            concat_frames([self.df_cleaned.loc[kept, derived], added_cleaned[derived]])
+        )
+        
+        # Cached snapshots and stage outputs describe the previous file
+        self.file_path = new_path
+        self.file_paths = [new_path]
+        self.content_hash = None
+        
+        print(
+            f"Dataset updated: {self.last_update['added']} added, {self.last_update['changed']} changed, "
+            f"{self.last_update['removed']} removed, {self.last_update['unchanged']} unchanged"
+        )
+        # Kept rows carry names merged over the previous release; merge afresh
+        self.df_cleaned['journal_clean'] = normalize_journal_names(self.df_cleaned['journal']).array
+        self._merge_journals()
+        self.downcast()
+        return True
+    
+    def _source_stamp(self):
+        """
+        Return what df_cleaned was built from: the cleaning versions, plus the
+        size and mtime of file_path when it is a single existing file
+        """
+        stamp = {'cleaning': cleaning_versions(), 'dedup': self.dedup}
+        if len(self.file_paths) == 1 and os.path.exists(self.file_path):
+            stat = os.stat(self.file_path)
+            stamp.update(size=stat.st_size, mtime_ns=stat.st_mtime_ns)
+        return stamp
+    
+    def export_arrow(self, path):
+        """
+        Write df_cleaned to an uncompressed Arrow IPC file for open_arrow()
+        
+        The file records the size and mtime of the source CSV so readers can
+        tell when it is stale. Arrow packs booleans into bits, so bool columns
+        are stored as uint8 bytes, which open_arrow views as bool without copying.
+        """
+        if self.df_cleaned is None:
+            print("Please clean data first using clean_data()")
+            return False
+        if self.is_sample:
+            print("Error: a sample cannot be exported in place of the full dataset")
+            return False
+        if self.ensure_columns(*self.deferred_columns) is None:
+            return False
+        
+        frame = self.df_cleaned.copy(deep=False)
+        bool_columns = [column for column in frame.columns if frame[column].dtype == 'bool']
+        for column in bool_columns:
+            frame[column] = frame[column].to_numpy().view('uint8')
+        table = pa.Table.from_pandas(frame, preserve_index=False)
+        metadata = dict(table.schema.metadata or {})
+        metadata[b'cord19_source'] = json.dumps(self._source_stamp()).encode()
+        metadata[b'cord19_bool_columns'] = json.dumps(bool_columns).encode()
+        table = table.replace_schema_metadata(metadata)
+        
+        # Several worker processes may export at once; each writes its own temporary file
+        tmp_path = _tmp_path(path)
+        with pa.OSFile(tmp_path, 'wb') as sink:
+            with pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+        os.replace(tmp_path, path)
+        print(f"Cleaned dataset exported to {path}")
+        return True
+    
+    def open_arrow(self, path):
+        """
+        Memory-map an Arrow IPC file written by export_arrow() as df_cleaned
+        
+        Columns are exposed to pandas without copying where possible, so every
+        process that opens the same file shares one copy in the OS page cache.
+        Returns False if the file is missing, older than the source CSV or
+        written by a different version of the cleaning code. The file holds
+        only cleaned rows, so df is cleared and update_data() needs load_data().
+        """
+        if self.frozen:
+            print("Error: analyzer is frozen and cannot be reloaded")
+            return False
+        
+        try:
+            table = pa.ipc.open_file(pa.memory_map(path, 'r')).read_all()
+        except (OSError, pa.ArrowInvalid) as e:
+            print(f"Could not open Arrow file {path}: {e}")
+            return False
+        
+        metadata = table.schema.metadata or {}
+        recorded = json.loads(metadata.get(b'cord19_source', b'null')) or {}
+        current = self._source_stamp()
+        if recorded.get('cleaning') != current['cleaning']:
+            print(f"Arrow file {path} was written by a different cleaning version")
+            return False
+        # Without the CSV at hand only the cleaning versions can be checked
+        if 'size' in current and recorded != current:
+            print(f"Arrow file {path} is stale for {self.file_path}")
+            return False
+        
+        cleaned = arrow_to_pandas(table, zero_copy=True)
+        bool_columns = json.loads(metadata.get(b'cord19_bool_columns', b'[]'))
+        if bool_columns:
+            # Assigning columns would copy them, concat with copy=False does not
+            cleaned = pd.concat([
+                pd.Series(cleaned[name].to_numpy().view('bool'), index=cleaned.index, name=name, copy=False)
+                if name in bool_columns else cleaned[name]
+                for name in cleaned.columns
+            ], axis=1, copy=False)
+        self.df = None
+        self.df_cleaned = cleaned
+        self.deferred_columns = []
+        self.is_sample = False
+        print(f"Dataset memory-mapped from {path}: {self.df_cleaned.shape[0]} rows")
+        return True
+    
+    def freeze(self):
+        """
+        Mark the analyzer as a read-only snapshot that may be shared between users
+        
+        A frozen analyzer refuses to load or clean again, so concurrent readers
+        never observe df or df_cleaned being replaced underneath them. Callers
+        must treat both frames as read-only and filter into new frames instead.
+        """
+        self.frozen = True
+        return self
     
     def basic_exploration(self):
         """
@@ -54,6 +2095,9 @@ class CORD19Analyzer:
         print("\nData types:")
         print(self.df.dtypes)
         
+        if self.deferred_columns:
+            print(f"\nNot loaded yet: {', '.join(self.deferred_columns)}")
+        
         print("\nMissing values by column:")
         missing_data = self.df.isnull().sum()
         print(missing_data[missing_data > 0])
@@ -61,62 +2105,161 @@ class CORD19Analyzer:
         print("\nBasic statistics for numerical columns:")
         print(self.df.describe())
     
-    def clean_data(self):
+    def clean_data(self, merge_journals=True):
         """
         Clean and prepare the data for analysis
+        
+        With merge_journals, spelling variants of one journal ('J Virol',
+        'Journal Of Virology') are merged into its most common name; see
+        journal_aliases. Shards skip this and are merged once combined.
         """
         if self.df is None:
             print("Please load data first using load_data()")
             return
+        if self.frozen:
+            print("Error: analyzer is frozen and cannot be cleaned again")
+            return self.df_cleaned
         
         print("=== DATA CLEANING ===")
-        self.df_cleaned = self.df.copy()
+        if self._shard_derived is not None:
+            # Shards were already cleaned in parallel by load_data
+            self.df_cleaned = self._overlay(self._shard_derived)
+            self._shard_derived = None
+            if merge_journals:
+                self._merge_journals()
+            self.downcast()
+            print(f"Data cleaning completed. Cleaned dataset shape: {self.df_cleaned.shape}")
+            return self.df_cleaned
         
-        # Handle publication date
-        print("Processing publication dates...")
-        self.df_cleaned['publish_time'] = pd.to_datetime(
-            self.df_cleaned['publish_time'], errors='coerce'
+        # Stage outputs are memoized per input (content hash) and stage version
+        self.df_cleaned, timings = run_cleaning_stages(
+            self.df,
+            data_key=self.content_hash,
+            load=self._load_stage,
+            store=self._store_stage,
+            deferred=self.deferred_columns,
+            fetch=self._fetch_columns,
         )
+        self.stage_timings = pd.DataFrame(timings, columns=['stage', 'source', 'seconds'])
+        for timing in timings:
+            print(f"  {timing['stage']}: {timing['seconds']:.3f}s ({timing['source']})")
+        if merge_journals:
+            self._merge_journals()
+        self.downcast()
         
-        # Extract year from publication date
-        self.df_cleaned['publication_year'] = self.df_cleaned['publish_time'].dt.year
-        
-        # Fill missing years with 2020 (most common year for COVID research)
-        self.df_cleaned['publication_year'] = self.df_cleaned['publication_year'].fillna(2020)
+        print(f"Data cleaning completed. Cleaned dataset shape: {self.df_cleaned.shape}")
         
-        # Create abstract word count
-        self.df_cleaned['abstract_word_count'] = self.df_cleaned['abstract'].apply(
-            lambda x: len(str(x).split()) if pd.notnull(x) else 0
-        )
+        return self.df_cleaned
+    
+    def load_aggregates(self, chunksize=100_000, progress=None, cancel=None):
+        """
+        Stream metadata.csv (or each shard in turn) in chunks and fold them into running aggregates
         
-        # Create title word count
-        self.df_cleaned['title_word_count'] = self.df_cleaned['title'].apply(
-            lambda x: len(str(x).split()) if pd.notnull(x) else 0
-        )
+        Only one chunk is held in memory at a time, so this works for files
+        that do not fit in RAM; compressed files are decompressed chunk by
+        chunk. Afterwards the analyze_* methods and get_summary_statistics
+        work from self.aggregates when df_cleaned is not loaded.
+        With dedup, a first pass over the files finds the row to keep for
+        each cord_uid, holding only an id and a score per row.
+        progress and cancel work as in load_data.
+        """
+        self.aggregates = CorpusAggregates(self._journal_alias_path())
+        self.load_stats = []
+        self.duplicates_dropped = 0
+        try:
+            keep = self._streaming_keep_mask(progress, cancel) if self.dedup else None
+            offset = 0
+            for path in self.file_paths:
+                with MeteredInput(path, progress=progress, cancel=cancel) as source:
+                    reader = pd.read_csv(
+                        source.stream,
+                        usecols=lambda column: column in METADATA_SCHEMA,
+                        dtype=METADATA_SCHEMA,
+                        chunksize=chunksize,
+                    )
+                    with reader:
+                        for chunk in reader:
+                            if keep is not None:
+                                chunk_keep = keep[offset:offset + len(chunk)]
+                                offset += len(chunk)
+                                chunk = chunk[chunk_keep]
+                            self.aggregates.add(clean_frame(chunk))
+                    self._record_throughput(source.stats())
+        except FileNotFoundError as e:
+            print(f"Error: File {e.filename or self.file_path} not found.")
+            self.aggregates = None
+            return False
+        except LoadCancelled as e:
+            print(f"Streaming {e} was cancelled")
+            self.aggregates = None
+            return False
+        except Exception as e:
+            print(f"Error streaming data: {e}")
+            self.aggregates = None
+            return False
         
-        # Clean journal names
-        self.df_cleaned['journal_clean'] = self.df_cleaned['journal'].fillna('Unknown')
-        self.df_cleaned['journal_clean'] = self.df_cleaned['journal_clean'].str.title()
+        if keep is not None:
+            if offset != len(keep):
+                print("Error streaming data: the de-duplication pass saw a different number of rows")
+                self.aggregates = None
+                return False
+            self.duplicates_dropped = int((~keep).sum())
+            print(f"Dropped {self.duplicates_dropped} duplicate {DEDUP_KEY} rows")
+        print(f"Aggregated {self.aggregates.total_papers} rows in chunks of {chunksize}")
+        return True
+    
+    def _streaming_keep_mask(self, progress, cancel):
+        """
+        Return the dedup mask over all rows of file_paths, from one extra pass
         
-        print(f"Data cleaning completed. Cleaned dataset shape: {self.df_cleaned.shape}")
+        Only the cord_uid column and a count of non-missing fields per row are
+        kept. Missing values are recognised as by the pandas parser, so the
+        scores match the chunks read afterwards.
+        """
+        ids = []
+        scores = []
+        for path in self.file_paths:
+            try:
+                file_ids, file_scores = _row_scores_pyarrow(path, progress, cancel)
+            except (FileNotFoundError, ImportError, LoadCancelled):
+                raise
+            except Exception as e:
+                print(f"Warning: pyarrow CSV engine failed ({e}); falling back to the C parser")
+                file_ids, file_scores = _row_scores_pandas(path, progress, cancel)
+            ids.extend(file_ids)
+            scores.extend(file_scores)
         
-        return self.df_cleaned
+        if not ids:
+            return np.zeros(0, dtype=bool)
+        codes = pc.dictionary_encode(pa.concat_arrays(ids)).indices.fill_null(-1).to_numpy()
+        return dedup_mask(codes, np.concatenate(scores))
+    
+    def _has_data(self):
+        """
+        Return True if either the cleaned frame or streamed aggregates are available
+        """
+        if self.df_cleaned is None and self.aggregates is None:
+            print("Please clean data first using clean_data() or stream it with load_aggregates()")
+            return False
+        return True
     
     def analyze_publications_over_time(self):
         """
         Analyze publication trends over time
         """
-        if self.df_cleaned is None:
-            print("Please clean data first using clean_data()")
+        if not self._has_data():
             return
         
         # Publications by year
-        yearly_counts = self.df_cleaned['publication_year'].value_counts().sort_index()
+        if self.df_cleaned is not None:
+            yearly_counts = self.df_cleaned['publication_year'].value_counts().sort_index()
+        else:
+            yearly_counts = self.aggregates.year_series()
         
         # Create visualization
         fig, ax = plt.subplots(figsize=(12, 6))
         yearly_counts.plot(kind='bar', ax=ax, color='skyblue')
-        ax.set_title('Number of COVID-19 Publications by Year', fontsize=16, fontweight='bold')
+        ax.set_title(self._approximate('Number of COVID-19 Publications by Year'), fontsize=16, fontweight='bold')
         ax.set_xlabel('Publication Year', fontsize=12)
         ax.set_ylabel('Number of Publications', fontsize=12)
         ax.tick_params(axis='x', rotation=45)
@@ -128,17 +2271,19 @@ class CORD19Analyzer:
         """
         Analyze top journals publishing COVID-19 research
         """
-        if self.df_cleaned is None:
-            print("Please clean data first using clean_data()")
+        if not self._has_data():
             return
         
         # Get top journals
-        journal_counts = self.df_cleaned['journal_clean'].value_counts().head(top_n)
+        if self.df_cleaned is not None:
+            journal_counts = top_counts(self.df_cleaned['journal_clean'], top_n)
+        else:
+            journal_counts = self.aggregates.journal_series().head(top_n)
         
         # Create visualization
         fig, ax = plt.subplots(figsize=(12, 8))
         journal_counts.plot(kind='barh', ax=ax, color='lightcoral')
-        ax.set_title(f'Top {top_n} Journals Publishing COVID-19 Research', fontsize=16, fontweight='bold')
+        ax.set_title(self._approximate(f'Top {top_n} Journals Publishing COVID-19 Research'), fontsize=16, fontweight='bold')
         ax.set_xlabel('Number of Publications', fontsize=12)
         ax.set_ylabel('Journal', fontsize=12)
         plt.tight_layout()
@@ -149,30 +2294,37 @@ class CORD19Analyzer:
         """
         Create a word cloud from paper titles
         """
-        if self.df_cleaned is None:
-            print("Please clean data first using clean_data()")
+        if not self._has_data():
             return
         
-        # Combine all titles
-        titles = ' '.join(self.df_cleaned['title'].dropna().astype(str))
-        
-        # Clean the text
-        titles_clean = re.sub(r'[^\w\s]', '', titles.lower())
-        
-        # Create word cloud
         wordcloud = WordCloud(
             width=800, 
             height=400, 
             background_color='white',
             max_words=100,
             colormap='viridis'
-        ).generate(titles_clean)
+        )
+        
+        if self.df_cleaned is not None:
+            # Combine all titles
+            titles = ' '.join(self.df_cleaned['title'].dropna().astype(str))
+            
+            # Clean the text
+            titles_clean = re.sub(r'[^\w\s]', '', titles.lower())
+            wordcloud.generate(titles_clean)
+        else:
+            # Streamed data only keeps word counts, not the titles themselves
+            frequencies = {
+                word: count for word, count in self.aggregates.title_words.items()
+                if word not in wordcloud.stopwords
+            }
+            wordcloud.generate_from_frequencies(frequencies)
         
         # Plot
         fig, ax = plt.subplots(figsize=(12, 6))
         ax.imshow(wordcloud, interpolation='bilinear')
         ax.axis('off')
-        ax.set_title('Most Frequent Words in Paper Titles', fontsize=16, fontweight='bold')
+        ax.set_title(self._approximate('Most Frequent Words in Paper Titles'), fontsize=16, fontweight='bold')
         plt.tight_layout()
         
         return fig
@@ -181,25 +2333,26 @@ class CORD19Analyzer:
         """
         Analyze word frequency in titles or abstracts
         """
-        if self.df_cleaned is None:
-            print("Please clean data first using clean_data()")
+        if not self._has_data():
             return
         
-        # Combine text from specified column
-        text = ' '.join(self.df_cleaned[column].dropna().astype(str))
-        
-        # Clean and tokenize
-        words = re.findall(r'\b[a-zA-Z]{3,}\b', text.lower())
+        # Count words in the specified column
+        if self.df_cleaned is not None:
+            df_cleaned = self.ensure_columns(column)
+            if df_cleaned is None:
+                return
+            word_freq = count_words(df_cleaned[column])
+        elif column in ('title', 'abstract'):
+            # Unary plus copies the counter without words whose count dropped to zero
+            word_freq = +getattr(self.aggregates, f'{column}_words')
+        else:
+            print(f"Word counts for '{column}' are not kept when streaming")
+            return
         
         # Remove common stop words
-        stop_words = {'the', 'and', 'of', 'in', 'to', 'a', 'for', 'with', 'on', 'by', 
-                     'as', 'an', 'from', 'that', 'this', 'is', 'are', 'was', 'were', 
-                     'be', 'been', 'have', 'has', 'had', 'but', 'not', 'at', 'which'}
-        
-        filtered_words = [word for word in words if word not in stop_words]
+        for word in STOP_WORDS:
+            word_freq.pop(word, None)
         
-        # Count frequency
-        word_freq = Counter(filtered_words)
         top_words = word_freq.most_common(top_n)
         
         # Create visualization
@@ -207,7 +2360,7 @@ class CORD19Analyzer:
         
         fig, ax = plt.subplots(figsize=(12, 8))
         ax.barh(words, counts, color='lightgreen')
-        ax.set_title(f'Top {top_n} Most Frequent Words in {column.capitalize()}', 
+        ax.set_title(self._approximate(f'Top {top_n} Most Frequent Words in {column.capitalize()}'), 
                     fontsize=16, fontweight='bold')
         ax.set_xlabel('Frequency', fontsize=12)
         plt.tight_layout()
@@ -218,18 +2371,20 @@ class CORD19Analyzer:
         """
         Analyze paper distribution by source
         """
-        if self.df_cleaned is None:
-            print("Please clean data first using clean_data()")
+        if not self._has_data():
             return
         
         # Count papers by source
-        source_counts = self.df_cleaned['source_x'].value_counts().head(10)
+        if self.df_cleaned is not None:
+            source_counts = top_counts(self.df_cleaned['source_x'], 10)
+        else:
+            source_counts = self.aggregates.source_series().head(10)
         
         # Create visualization
         fig, ax = plt.subplots(figsize=(10, 8))
         ax.pie(source_counts.values, labels=source_counts.index, autopct='%1.1f%%', 
                startangle=90, colors=plt.cm.Set3(np.linspace(0, 1, len(source_counts))))
-        ax.set_title('Distribution of Papers by Source', fontsize=16, fontweight='bold')
+        ax.set_title(self._approximate('Distribution of Papers by Source'), fontsize=16, fontweight='bold')
         plt.tight_layout()
         
         return fig, source_counts
@@ -238,13 +2393,14 @@ class CORD19Analyzer:
         """
         Generate summary statistics for the dataset
         """
-        if self.df_cleaned is None:
-            print("Please clean data first using clean_data()")
+        if not self._has_data():
             return
+        if self.df_cleaned is None:
+            return self.aggregates.summary()
         
         summary = {
             'total_papers': len(self.df_cleaned),
-            'papers_with_abstract': self.df_cleaned['abstract'].notna().sum(),
+            'papers_with_abstract': len(self.df_cleaned) - self._null_count('abstract'),
             'papers_with_full_text': self.df_cleaned['has_full_text'].sum() if 'has_full_text' in self.df_cleaned.columns else 'N/A',
             'earliest_publication': self.df_cleaned['publication_year'].min(),
             'latest_publication': self.df_cleaned['publication_year'].max(),
@@ -253,8 +2409,84 @@ class CORD19Analyzer:
             'unique_sources': self.df_cleaned['source_x'].nunique() if 'source_x' in self.df_cleaned.columns else 'N/A'
         }
         
+        if self.is_sample:
+            # Scale sample counts up to estimates for the whole file
+            scale = self.population_size / len(self.df_cleaned)
+            summary['total_papers'] = self.population_size
+            for key in ('papers_with_abstract', 'papers_with_full_text'):
+                if summary[key] != 'N/A':
+                    summary[key] = int(round(summary[key] * scale))
+            summary['approximate'] = True
+            summary['sample_size'] = len(self.df_cleaned)
+        
         return summary
 
+def _row_scores_pyarrow(path, progress, cancel):
+    """
+    Return the cord_uid arrays and non-missing field counts of a metadata CSV's rows, per block
+    
+    Only validity matters here, so every column is read as text: values
+    such as '123.0' in an integer column still count, as in pandas.
+    """
+    ids = []
+    scores = []
+    with MeteredInput(path, progress=progress, cancel=cancel) as source:
+        options = _pyarrow_csv_options(source.stream, None, None, METADATA_SCHEMA)
+        convert_options = options['convert_options']
+        convert_options.null_values = sorted(STR_NA_VALUES)
+        convert_options.column_types = {column: pa.string() for column in convert_options.include_columns}
+        for batch in pacsv.open_csv(source.stream, **options):
+            score = np.zeros(batch.num_rows, dtype='int16')
+            for column in batch.columns:
+                score += pc.is_valid(column).to_numpy(zero_copy_only=False)
+            scores.append(score)
+            if DEDUP_KEY in batch.schema.names:
+                ids.append(batch.column(DEDUP_KEY))
+            else:
+                ids.append(pa.nulls(batch.num_rows, pa.string()))
+    return ids, scores
+
+
+def _row_scores_pandas(path, progress, cancel, chunksize=100_000):
+    """
+    Return the same as _row_scores_pyarrow, parsed by pandas as load_aggregates does
+    """
+    ids = []
+    scores = []
+    with MeteredInput(path, progress=progress, cancel=cancel) as source:
+        reader = pd.read_csv(
+            source.stream,
+            usecols=lambda column: column in METADATA_SCHEMA,
+            dtype=METADATA_SCHEMA,
+            chunksize=chunksize,
+        )
+        with reader:
+            for chunk in reader:
+                scores.append(chunk.notna().sum(axis=1).to_numpy(dtype='int16'))
+                if DEDUP_KEY in chunk.columns:
+                    ids.append(pa.array(chunk[DEDUP_KEY], type=pa.string(), from_pandas=True))
+                else:
+                    ids.append(pa.nulls(len(chunk), pa.string()))
+    return ids, scores
+
+
+def _load_and_clean_shard(path, cache_dir, engine, block_size, threads, dedup):
+    """
+    Load and clean one shard in a worker process
+    
+    Returns (raw frame, derived columns, load stats, duplicates dropped).
+    A failed load is raised again with the shard's path.
+    """
+    analyzer = CORD19Analyzer(path, cache_dir=cache_dir, dedup=dedup)
+    if not analyzer.load_data(engine=engine, block_size=block_size, threads=threads):
+        if isinstance(analyzer.load_error, FileNotFoundError):
+            raise FileNotFoundError(path)
+        raise RuntimeError(f"{path}: {analyzer.load_error}")
+    analyzer.clean_data(merge_journals=False)
+    return (analyzer.df, analyzer.df_cleaned[analyzer._derived_columns()],
+            analyzer.load_stats, analyzer.duplicates_dropped)
+
+
 # Example usage
 if __name__ == "__main__":
     analyzer = CORD19Analyzer('metadata.csv')
@@ -0,0 +1,231 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pytest
+
+import data_analysis
+from data_analysis import CORD19Analyzer, canonical_journal_name, count_tokens, journal_aliases, parse_publish_time
+
+
+def write_release(path, rows):
+    """
+    Write a small metadata.csv with the given (cord_uid, title, year, journal, has_full_text) rows
+    """
+    pd.DataFrame(
+        [
+            {
+                'cord_uid': uid,
+                'source_x': 'Medline',
+                'title': title,
+                'abstract': f'abstract of {title}',
+                'publish_time': f'{year}-03-01' if year else None,
+                'journal': journal,
+                'license': 'cc-by',
+                'has_full_text': full_text,
+            }
+            for uid, title, year, journal, full_text in rows
+        ]
+    ).to_csv(path, index=False)
+
+
+@pytest.mark.parametrize('change', ['size', 'mtime', 'content'])
+def test_snapshot_invalidation(tmp_path, capsys, change):
+    rows = [(f'u{i}', f'paper {i}', 2020, 'Vaccine', True) for i in range(10)]
+    path = tmp_path / 'metadata.csv'
+    write_release(path, rows)
+    assert CORD19Analyzer(str(path), cache_dir=str(tmp_path / 'cache')).load_data()
+    
+    stat = os.stat(path)
+    if change == 'size':
+        rows.append(('u10', 'paper 10', 2020, 'Vaccine', True))
+    elif change == 'content':
+        # Same size, different bytes, so only the content hash tells
+        rows[0] = ('u0', 'paper X', 2020, 'Vaccine', True)
+    write_release(path, rows)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    if change != 'size':
+        assert os.path.getsize(path) == stat.st_size
+    
+    capsys.readouterr()
+    analyzer = CORD19Analyzer(str(path), cache_dir=str(tmp_path / 'cache'))
+    assert analyzer.load_data()
+    from_cache = 'loaded from cache' in capsys.readouterr().out
+    # Touching the file alone keeps the snapshot; its hash proves the content unchanged
+    assert from_cache == (change == 'mtime')
+    assert analyzer.df['title'].tolist() == [title for _, title, _, _, _ in rows]
+
+
+def test_bumped_stage_recomputes_only_its_dependents(tmp_path, monkeypatch):
+    rows = [(f'u{i}', f'paper {i}', 2019 + i % 3, 'Vaccine', True) for i in range(10)]
+    write_release(tmp_path / 'metadata.csv', rows)
+    
+    def clean():
+        analyzer = CORD19Analyzer(str(tmp_path / 'metadata.csv'), cache_dir=str(tmp_path / 'cache'))
+        assert analyzer.load_data()
+        analyzer.clean_data()
+        sources = dict(zip(analyzer.stage_timings['stage'], analyzer.stage_timings['source']))
+        # Columns are read as categoricals already, so this stage has no outputs to store
+        del sources['encode_categories']
+        return sources
+    
+    assert set(clean().values()) == {'computed'}
+    assert set(clean().values()) == {'cached'}
+    
+    stages = [
+        stage._replace(version=stage.version + 1) if stage.name == 'extract_year' else stage
+        for stage in data_analysis.CLEANING_STAGES
+    ]
+    monkeypatch.setattr(data_analysis, 'CLEANING_STAGES', stages)
+    # impute_year reads publication_year, which extract_year writes
+    assert clean() == {
+        'parse_dates': 'cached', 'extract_year': 'computed', 'impute_year': 'computed',
+        'word_counts': 'cached', 'normalize_journals': 'cached',
+    }
+
+
+def test_lazy_abstracts_load_on_first_use(tmp_path):
+    rows = [(f'u{i}', f'paper {i}', 2020, 'Vaccine', True) for i in range(10)]
+    write_release(tmp_path / 'metadata.csv', rows)
+    eager = CORD19Analyzer(str(tmp_path / 'metadata.csv'), cache_dir=str(tmp_path / 'cache'))
+    assert eager.load_data()
+    eager.clean_data()
+    
+    lazy = CORD19Analyzer(str(tmp_path / 'metadata.csv'), cache_dir=str(tmp_path / 'cache'), lazy_columns=['abstract'])
+    assert lazy.load_cleaned()
+    assert lazy.deferred_columns == ['abstract']
+    assert 'abstract' not in lazy.df_cleaned.columns
+    
+    cleaned = lazy.ensure_columns('abstract')
+    assert lazy.deferred_columns == []
+    assert cleaned['abstract'].tolist() == eager.df_cleaned['abstract'].tolist()
+    assert cleaned['abstract_word_count'].tolist() == eager.df_cleaned['abstract_word_count'].tolist()
+
+
+def test_update_after_downcast_matches_full_rebuild(tmp_path):
+    first = [(f'u{i}', f'paper {i}', 2019 + i % 3, 'Vaccine', i % 2 == 0) for i in range(40)]
+    first.append(('u40', 'undated paper', None, 'Vaccine', False))
+    second = first[5:] + [('n1', 'new paper', 2021, 'Vaccine', True)]
+    third = second[3:] + [('n2', 'newer paper', 2022, 'Cell', False)]
+    for name, rows in [('r1.csv', first), ('r2.csv', second), ('r3.csv', third)]:
+        write_release(tmp_path / name, rows)
+    
+    analyzer = CORD19Analyzer(str(tmp_path / 'r1.csv'), cache_dir=None)
+    assert analyzer.load_data()
+    analyzer.clean_data()
+    assert analyzer.df_cleaned['has_full_text'].dtype == 'bool'
+    assert analyzer.load_aggregates()
+    
+    # Downcast columns must survive being concatenated with freshly parsed rows
+    assert analyzer.update_data(str(tmp_path / 'r2.csv'))
+    assert analyzer.update_data(str(tmp_path / 'r3.csv'))
+    assert analyzer.df_cleaned['has_full_text'].dtype == 'bool'
+    
+    rebuilt = CORD19Analyzer(str(tmp_path / 'r3.csv'), cache_dir=None)
+    assert rebuilt.load_data()
+    rebuilt.clean_data()
+    expected = rebuilt.get_summary_statistics()
+    assert analyzer.get_summary_statistics() == expected
+    assert analyzer.aggregates.summary()['papers_with_full_text'] == expected['papers_with_full_text']
+    assert all(type(year) is int for year in analyzer.aggregates.year_counts)
+    assert analyzer.df_cleaned.dtypes.to_dict() == rebuilt.df_cleaned.dtypes.to_dict()
+
+
+def test_open_arrow_shares_memory_and_keeps_dtypes(tmp_path, monkeypatch):
+    rows = [(f'u{i}', f'paper {i}', 2019 + i % 3, 'Vaccine', i % 2 == 0) for i in range(40)]
+    write_release(tmp_path / 'metadata.csv', rows)
+    analyzer = CORD19Analyzer(str(tmp_path / 'metadata.csv'), cache_dir=None)
+    assert analyzer.load_data()
+    analyzer.clean_data()
+    assert analyzer.export_arrow(str(tmp_path / 'cleaned.arrow'))
+    
+    maps = []
+    memory_map = pa.memory_map
+    
+    def recording_memory_map(*args):
+        maps.append(memory_map(*args))
+        return maps[-1]
+    
+    monkeypatch.setattr(data_analysis.pa, 'memory_map', recording_memory_map)
+    mapped = CORD19Analyzer(str(tmp_path / 'metadata.csv'), cache_dir=None)
+    assert mapped.open_arrow(str(tmp_path / 'cleaned.arrow'))
+    maps[0].seek(0)
+    file_bytes = np.frombuffer(maps[0].read_buffer(), dtype='uint8')
+    
+    for name, dtype in analyzer.df_cleaned.dtypes.items():
+        column = mapped.df_cleaned[name]
+        if isinstance(dtype, pd.StringDtype):
+            assert column.dtype == 'string'
+            continue
+        assert column.dtype == dtype, name
+        if dtype.kind in 'biu':
+            assert np.shares_memory(column.to_numpy(), file_bytes), name
+    pd.testing.assert_frame_equal(mapped.df_cleaned.astype(str), analyzer.df_cleaned.astype(str))
+    
+    # The file has no raw rows, so updating refuses instead of failing on df
+    assert mapped.df is None
+    assert mapped.downcast() == 0
+    assert not mapped.update_data(str(tmp_path / 'metadata.csv'))
+
+
+def test_sample_counts_distinct_papers(tmp_path):
+    rows = [(f'u{i % 30}', f'paper {i}', 2020, 'Vaccine', True) for i in range(60)]
+    write_release(tmp_path / 'metadata.csv', rows)
+    
+    sample = CORD19Analyzer(str(tmp_path / 'metadata.csv'), cache_dir=None)
+    assert sample.load_sample(n=10, seed=0)
+    assert len(sample.df) == 10
+    assert not sample.df['cord_uid'].duplicated().any()
+    
+    full = CORD19Analyzer(str(tmp_path / 'metadata.csv'), cache_dir=None)
+    assert full.load_data()
+    assert sample.population_size == len(full.df) == 30
+
+
+@pytest.mark.parametrize('dtype', [object, 'string[python]', 'string[pyarrow]'])
+def test_count_tokens_matches_str_split(dtype):
+    values = [
+        'two words', '  padded  text ', 'tab\tand\nnewline', '', '   ', 'Ünïcode wörds',
+        'non\xa0breaking', 'ideographic\u3000space', 'vertical\x0btab\x0cfeed', None, 'one',
+    ]
+    series = pd.Series(values, dtype=dtype)
+    expected = series.apply(lambda x: len(str(x).split()) if pd.notna(x) else 0)
+    assert count_tokens(series).tolist() == expected.tolist()
+
+
+def test_parse_publish_time_matches_to_datetime():
+    series = pd.Series([
+        '2020-03-01', '2020', '2020 Mar 5', '2020-03', 'Mar 2020', '2019-12-31 00:00:00',
+        '2021/04/05', '2020-13-01', 'not a date', '', None, '2020-03-01',
+    ], dtype=object)
+    pd.testing.assert_series_equal(parse_publish_time(series), pd.to_datetime(series, errors='coerce'))
+
+
+@pytest.mark.parametrize('variant, name', [
+    ('J Virol', 'Journal of Virology'),
+    ('J. Med. Virol.', 'Journal of Medical Virology'),
+    ('Journal of Virolgy', 'Journal of Virology'),
+    ('Journal of Infectious Disease', 'Journal of Infectious Diseases'),
+    ('The Lancet', 'Lancet'),
+    ('Cafe Medical', 'Café Médical'),
+])
+def test_journal_variants_merge(variant, name):
+    counts = {canonical_journal_name(variant): 1, canonical_journal_name(name): 10}
+    assert journal_aliases(counts) == {canonical_journal_name(variant): canonical_journal_name(name)}
+
+
+@pytest.mark.parametrize('names', [
+    ('Journal of Hepatology', 'Journal of Hematology'),
+    ('Journal of Immunology', 'Journal of Virology'),
+    ('Virology Journal', 'Journal of Virology'),
+    ('Vaccine', 'Vaccines'),
+    ('Cancer', 'Cancers'),
+    ('Covid-19', 'Covid-20'),
+    ('Annals of Surgery', 'Annals of Surgeon'),
+    # Ambiguous abbreviations are not merged into either journal
+    ('Journal of Applied Physiology', 'Journal of Applied Physics', 'J Appl Phys'),
+])
+def test_distinct_journals_stay_apart(names):
+    counts = {canonical_journal_name(name): 10 - i for i, name in enumerate(names)}
+    assert journal_aliases(counts) == {}